@@ -1,16 +1,37 @@
-import requests
+import time
+# Taken before the other imports so the startup report includes them
+STARTUP_STARTED = time.perf_counter()
+
+import asyncio
+import bisect
+import json
 import os
+import random
+import sqlite3
+import threading
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+import aiohttp
 import discord
 from discord.ext import commands, tasks
 from datetime import datetime, timedelta, timezone, date
 import pytz
-import difflib
-from supabase import create_client, Client
-import statsapi
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import importlib.util
+import re
+import unicodedata
+import zlib
+from collections import OrderedDict
+from contextlib import closing
 import io
-from bs4 import BeautifulSoup
-import matplotlib.pyplot as plt
+
+# supabase, statsapi, bs4, matplotlib and difflib are imported where they're used,
+# so they load on first use (or in the background after on_ready), not at startup
+
+# Startup timing report: import, Supabase client creation, login and cache warm-up
+startup_timings = {'imports': time.perf_counter() - STARTUP_STARTED}
+startup_state = {'login_started': None, 'warmed': False}
 
 # Load environment variables from .env file
 load_dotenv()
@@ -19,8 +40,70 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Supabase client, created on first use from a database worker thread
+supabase_client = None
+supabase_client_lock = threading.Lock()
+
+
+def get_supabase():
+    global supabase_client
+    if supabase_client is None:
+        with supabase_client_lock:
+            if supabase_client is None:
+                started = time.perf_counter()
+                from supabase import create_client
+                supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+                startup_timings['supabase client'] = time.perf_counter() - started
+    return supabase_client
+
+
+# Imports the heavy dependencies so the first command using them is fast
+WARM_IMPORTS = ['difflib', 'statsapi', 'bs4', 'numpy',
+                'matplotlib.figure', 'matplotlib.backends.backend_agg']
+
+
+def warm_imports():
+    for module_name in WARM_IMPORTS:
+        importlib.import_module(module_name)
+    get_supabase()
+
+
+# Runs once after the first on_ready: background imports, then the cache warm-ups
+async def warm_startup():
+    started = time.perf_counter()
+    await asyncio.to_thread(warm_imports)
+    startup_timings['background imports'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    # Warm the team data cache so the first stats command doesn't pay for it
+    try:
+        await get_team_data()
+    except Exception as e:
+        print(f"Failed to warm team data cache: {e}")
+
+    try:
+        await get_guild_settings()
+    except Exception as e:
+        print(f"Failed to load guild settings: {e}")
+
+    # Load the in-process leaderboard ranking once, settlement keeps it current.
+    # Settlement only runs on the leader, so other processes query the database instead
+    if IS_LEADER and not leaderboard_ranking['loaded']:
+        try:
+            await load_ranking()
+        except Exception as e:
+            print(f"Failed to load leaderboard ranking: {e}")
+    startup_timings['cache warm-up'] = time.perf_counter() - started
+
+    report = ', '.join(f"{name} {seconds:.2f}s" for name,
+                       seconds in startup_timings.items())
+    print(f"Startup timings: {report}")
+
+
+# Calls a statsapi function, importing statsapi on first use (runs in a worker thread)
+def statsapi_call(function_name, *args, **kwargs):
+    import statsapi
+    return getattr(statsapi, function_name)(*args, **kwargs)
 
 
 # Initialize the bot with commands and intents
@@ -29,9 +112,23 @@ intents.messages = True
 intents.guilds = True
 intents.message_content = True  # Ensure the bot can read message content
 
+# Sharding: SHARD_MODE=auto runs an AutoShardedBot, SHARD_COUNT/SHARD_IDS let
+# several processes each own a shard range. The process that owns shard 0
+# is the leader and the only one that runs the scheduled jobs
+SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS', '').split(',')
+             if shard_id.strip()] or None
+SHARDED = os.getenv('SHARD_MODE', '').lower() == 'auto' or \
+    SHARD_COUNT is not None or SHARD_IDS is not None
+IS_LEADER = SHARD_IDS is None or 0 in SHARD_IDS
+
 prefixes = ['mlb ', 'MLB ']
-bot = commands.Bot(command_prefix=['mlb ', 'MLB '],
-                   intents=intents, help_command=None)
+if SHARDED:
+    bot = commands.AutoShardedBot(command_prefix=['mlb ', 'MLB '], intents=intents,
+                                  help_command=None, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+else:
+    bot = commands.Bot(command_prefix=['mlb ', 'MLB '],
+                       intents=intents, help_command=None)
 
 # Initializes the bot when it is logged on
 
@@ -39,12 +136,30 @@ bot = commands.Bot(command_prefix=['mlb ', 'MLB '],
 @bot.event
 async def on_ready():
     print(f'We have logged in as {bot.user}')
+    if startup_state['login_started'] is not None and 'login' not in startup_timings:
+        startup_timings['login'] = time.perf_counter() - \
+            startup_state['login_started']
     activity = discord.Game(name="MLB Help")
     await bot.change_presence(status=discord.Status.online, activity=activity)
-    daily_odds.start()  # Start the daily odds task
-    daily_scores_task.start()  # Start the daily scores task
-    daily_games_task.start()  # Start the daily games task
-    daily_check_winners_task.start()  # Start the daily winner check task
+    if IS_LEADER and scheduler_state['task'] is None:
+        # Start the scheduler for the daily odds, results, games, winners and game log jobs
+        scheduler_state['task'] = asyncio.create_task(run_scheduler())
+    if not refresh_player_index_task.is_running():
+        refresh_player_index_task.start()  # Build and periodically refresh the player index
+    if IS_LEADER:
+        start_live_scores()  # Picks up games already in progress after a restart
+
+    # Warm imports and caches in the background so on_ready returns right away
+    if not startup_state['warmed']:
+        startup_state['warmed'] = True
+        asyncio.create_task(warm_startup())
+
+EASTERN = pytz.timezone('US/Eastern')
+
+
+# Current Eastern date with DST handling, used to scope "today's games"
+def today_est() -> date:
+    return datetime.now(EASTERN).date()
 
 # Function to convert time to EST with DST handling
 
@@ -71,27 +186,868 @@ def convert_to_12hr_format(timestamp: str) -> str:
     return dt.strftime('%Y-%m-%d %I:%M:%S %p')
 
 
-# get team data from supabase
+# Shared async HTTP client used by every upstream fetch (Odds API, CBS game logs)
+HTTP_TIMEOUT_SECONDS = float(os.getenv('HTTP_TIMEOUT_SECONDS', '15'))
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+HTTP_BACKOFF_SECONDS = float(os.getenv('HTTP_BACKOFF_SECONDS', '0.5'))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '20'))
+HTTP_PER_HOST_LIMIT = int(os.getenv('HTTP_PER_HOST_LIMIT', '4'))
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
 
+http_session = None
+host_semaphores = {}
 
-def get_team_data():
-    response = supabase.table('team_data').select('*').execute()
 
-    team_data = {}
-    for team in response.data:
-        team_name = team['team_name']
-        team_data[team_name] = {
-            'color': team['color'],
-            'logo': team['logo']
-        }
+# Response wrapper with the same attributes the fetchers used from requests
+class HttpResponse:
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+# Creates the pooled keep-alive session on first use (it must live on the bot's loop)
+def get_http_session():
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_SIZE, keepalive_timeout=60, ttl_dns_cache=300)
+        http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+        )
+    return http_session
+
+
+async def close_http_session():
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+
+# GET with a per-host concurrency limit and retry/backoff on timeouts, 429s and 5xx.
+# Returns the last response (or None if every attempt failed at the network level)
+async def http_get(url, params=None, headers=None):
+    session = get_http_session()
+    host = urlparse(url).netloc
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    semaphore = host_semaphores[host]
+
+    result = None
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        delay = HTTP_BACKOFF_SECONDS * (2 ** attempt) + \
+            random.uniform(0, HTTP_BACKOFF_SECONDS)
+        try:
+            async with semaphore:
+                async with session.get(url, params=params, headers=headers) as response:
+                    content = await response.read()
+                    result = HttpResponse(
+                        response.status, response.headers.copy(), content)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Request to {host} failed (attempt {attempt + 1}): {e!r}")
+            result = None
+        else:
+            if result.status_code not in HTTP_RETRY_STATUSES:
+                return result
+            retry_after = result.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            print(f"Request to {host} returned {
+                  result.status_code} (attempt {attempt + 1})")
+
+        if attempt < HTTP_MAX_RETRIES:
+            await asyncio.sleep(delay)
+
+    return result
+
+
+# Outbound Discord messages: embeds are packed up to Discord's per-message
+# limits and sends are paced per channel with a token bucket sized to the
+# channel's message rate limit (5 messages per 5 seconds)
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARS_PER_MESSAGE = 6000
+CHANNEL_SEND_BURST = int(os.getenv('CHANNEL_SEND_BURST', '5'))
+CHANNEL_SEND_PER_SECOND = float(os.getenv('CHANNEL_SEND_PER_SECOND', '1'))
+channel_send_buckets = {}
+
+
+# Waits for a send token for the channel, refilling the bucket by elapsed time
+async def acquire_send_token(channel_id):
+    bucket = channel_send_buckets.setdefault(
+        channel_id, {'tokens': CHANNEL_SEND_BURST, 'updated': time.monotonic()})
+    while True:
+        now = time.monotonic()
+        bucket['tokens'] = min(CHANNEL_SEND_BURST, bucket['tokens'] +
+                               (now - bucket['updated']) * CHANNEL_SEND_PER_SECOND)
+        bucket['updated'] = now
+        if bucket['tokens'] >= 1:
+            bucket['tokens'] -= 1
+            return
+        await asyncio.sleep((1 - bucket['tokens']) / CHANNEL_SEND_PER_SECOND)
+
+
+# Groups embeds into messages of at most 10 embeds and 6000 characters
+def pack_embeds(embeds):
+    batches = []
+    batch, batch_chars = [], 0
+    for embed in embeds:
+        embed_chars = len(embed)
+        if batch and (len(batch) == EMBEDS_PER_MESSAGE or batch_chars + embed_chars > EMBED_CHARS_PER_MESSAGE):
+            batches.append(batch)
+            batch, batch_chars = [], 0
+        batch.append(embed)
+        batch_chars += embed_chars
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+# Sends to a channel or command context, pacing on the target channel's bucket
+async def send_paced(destination, **kwargs):
+    channel = getattr(destination, 'channel', destination)
+    await acquire_send_token(channel.id)
+    return await destination.send(**kwargs)
+
+
+async def send_embeds(destination, embeds):
+    for batch in pack_embeds(embeds):
+        await send_paced(destination, embeds=batch)
+
+
+# Bounded thread pool for Supabase calls so blocking round trips stay off the event loop
+SUPABASE_MAX_WORKERS = int(os.getenv('SUPABASE_MAX_WORKERS', '8'))
+db_executor = ThreadPoolExecutor(
+    max_workers=SUPABASE_MAX_WORKERS, thread_name_prefix='supabase')
+
+
+# Builds and executes a query in the pool and returns the Supabase response
+async def run_query(build_query):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, lambda: build_query().execute())
+
+
+# Bulk reads and writes are split so request URLs and bodies stay a sane size
+SUPABASE_BULK_CHUNK_SIZE = int(os.getenv('SUPABASE_BULK_CHUNK_SIZE', '500'))
+
+
+def chunked(items, size):
+    items = list(items)
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+# PostgREST caps every response at max_rows (1000 on Supabase), so full-table
+# reads walk an ordered query one range at a time until a short page comes back
+SUPABASE_PAGE_SIZE = int(os.getenv('SUPABASE_PAGE_SIZE', '1000'))
+
+
+async def fetch_all_pages(build_query):
+    rows = []
+    while True:
+        offset = len(rows)
+        response = await run_query(
+            lambda: build_query().range(offset, offset + SUPABASE_PAGE_SIZE - 1))
+        rows.extend(response.data)
+        if len(response.data) < SUPABASE_PAGE_SIZE:
+            return rows
+
+
+# Scheduler run markers repository
+
+
+async def fetch_scheduler_runs():
+    response = await run_query(lambda: get_supabase().table('scheduler_runs').select('*'))
+    return {row['job_name']: date.fromisoformat(row['last_run_date']) for row in response.data}
+
+
+async def upsert_scheduler_run(job_name, run_date, status):
+    await run_query(lambda: get_supabase().table('scheduler_runs').upsert({
+        'job_name': job_name,
+        'last_run_date': run_date.isoformat(),
+        'status': status,
+        'finished_at': datetime.now(timezone.utc).isoformat()
+    }, on_conflict='job_name'))
+
+
+# Users repository
+
+
+async def fetch_user(user_id):
+    response = await run_query(
+        lambda: get_supabase().table('users').select('*').eq('user_id', user_id))
+    return response.data[0] if response.data else None
+
+
+async def fetch_users_with_picks():
+    return await fetch_all_pages(
+        lambda: get_supabase().table('users').select('*')
+        .not_.is_('current_pick', 'null').order('user_id'))
+
+
+# Settles picks with one update per distinct new streak, touching only the settled columns
+async def update_user_streaks(users):
+    user_ids_by_streak = {}
+    for user in users:
+        user_ids_by_streak.setdefault(user['streak'], []).append(user['user_id'])
+    for streak, user_ids in user_ids_by_streak.items():
+        for chunk in chunked(user_ids, SUPABASE_BULK_CHUNK_SIZE):
+            await run_query(
+                lambda: get_supabase().table('users').update({'streak': streak, 'current_pick': None})
+                .in_('user_id', chunk))
+
+
+# Ordered, limited leaderboard page served by the index on users.streak
+async def fetch_top_users(offset, limit):
+    response = await run_query(
+        lambda: get_supabase().table('users').select('user_id,username,streak')
+        .order('streak', desc=True).range(offset, offset + limit - 1))
+    return response.data
+
+
+async def count_users_above_streak(streak):
+    response = await run_query(
+        lambda: get_supabase().table('users').select('user_id', count='exact')
+        .gt('streak', streak).limit(1))
+    return response.count or 0
+
+
+async def fetch_ranking_rows():
+    return await fetch_all_pages(
+        lambda: get_supabase().table('users').select('user_id,username,streak').order('user_id'))
+
+
+async def insert_user(user):
+    await run_query(lambda: get_supabase().table('users').insert(user))
+
+
+async def update_user(user_id, fields):
+    await run_query(
+        lambda: get_supabase().table('users').update(fields).eq('user_id', user_id))
+
+
+# Games repository
+
+
+async def fetch_game(game_id):
+    response = await run_query(
+        lambda: get_supabase().table('games').select('*').eq('game_id', game_id))
+    return response.data[0] if response.data else None
+
+
+# Date-scoped games query on the indexed Eastern game_date column
+async def fetch_games_between(start_date, end_date):
+    response = await run_query(
+        lambda: get_supabase().table('games').select('*')
+        .gte('game_date', start_date.isoformat())
+        .lte('game_date', end_date.isoformat()))
+    return response.data
+
+
+async def fetch_games_by_ids(game_ids):
+    games = []
+    for chunk in chunked(game_ids, SUPABASE_BULK_CHUNK_SIZE):
+        response = await run_query(
+            lambda: get_supabase().table('games').select('*').in_('game_id', chunk))
+        games.extend(response.data)
+    return games
+
+
+async def upsert_games(games):
+    for chunk in chunked(games, SUPABASE_BULK_CHUNK_SIZE):
+        await run_query(
+            lambda: get_supabase().table('games').upsert(chunk, on_conflict='game_id'))
+
+
+async def insert_game(game):
+    await run_query(lambda: get_supabase().table('games').insert(game))
+
+
+async def update_game(game_id, fields):
+    await run_query(
+        lambda: get_supabase().table('games').update(fields).eq('game_id', game_id))
+
+
+# Players repository
+
+
+async def fetch_all_players():
+    return await fetch_all_pages(
+        lambda: get_supabase().table('players').select('*').order('player_name'))
+
+
+async def update_player(player_name, fields):
+    await run_query(
+        lambda: get_supabase().table('players').update(fields).eq('player_name', player_name))
+
+
+async def fetch_player(player_name):
+    response = await run_query(
+        lambda: get_supabase().table('players').select('*').eq('player_name', player_name))
+    return response.data[0] if response.data else None
+
+
+# Team data repository
+
+
+async def fetch_team_rows():
+    response = await run_query(lambda: get_supabase().table('team_data').select('*'))
+    return response.data
+
+
+# Guild settings repository
+
+
+async def fetch_guild_settings_rows():
+    response = await run_query(lambda: get_supabase().table('guild_settings').select('*'))
+    return response.data
+
+
+async def upsert_guild_settings(row):
+    response = await run_query(lambda: get_supabase().table('guild_settings').upsert(
+        row, on_conflict='guild_id'))
+    return response.data
+
+
+# Cache shared by every bot process of a sharded deployment, so the odds,
+# scores, team, player and slate data are fetched upstream once rather than
+# once per process. Disabled (process-local caches only) without SHARED_CACHE_PATH
+SHARED_CACHE_PATH = os.getenv('SHARED_CACHE_PATH', '')
+
+
+def open_shared_cache_db():
+    connection = sqlite3.connect(SHARED_CACHE_PATH, timeout=30)
+    connection.execute("""
+        create table if not exists shared_cache (
+            key text primary key,
+            stored_at real not null,
+            data blob not null
+        )
+    """)
+    return connection
+
+
+def load_shared_entry(key):
+    with closing(open_shared_cache_db()) as connection:
+        row = connection.execute(
+            "select stored_at, data from shared_cache where key = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    return {'stored_at': row[0], 'data': json.loads(zlib.decompress(row[1]))}
+
+
+def store_shared_entry(key, data):
+    blob = zlib.compress(json.dumps(data).encode('utf-8'))
+    with closing(open_shared_cache_db()) as connection, connection:
+        connection.execute(
+            "insert or replace into shared_cache values (?, ?, ?)", (key, time.time(), blob))
+
+
+def delete_shared_entry(key):
+    with closing(open_shared_cache_db()) as connection, connection:
+        connection.execute("delete from shared_cache where key = ?", (key,))
+
+
+# Returns (data, age in seconds), loading and sharing it if the shared copy is
+# missing or older than max_age. Empty results aren't shared, they may be a failed fetch
+async def shared_fetch(key, max_age, load):
+    if SHARED_CACHE_PATH:
+        try:
+            entry = await asyncio.to_thread(load_shared_entry, key)
+        except sqlite3.Error as e:
+            print(f"Failed to read shared cache entry {key}: {e}")
+            entry = None
+        if entry is not None and time.time() - entry['stored_at'] < max_age:
+            return entry['data'], max(time.time() - entry['stored_at'], 0.0)
+
+    data = await load()
+    if SHARED_CACHE_PATH and data:
+        try:
+            await asyncio.to_thread(store_shared_entry, key, data)
+        except sqlite3.Error as e:
+            print(f"Failed to write shared cache entry {key}: {e}")
+    return data, 0.0
+
+
+async def shared_invalidate(key):
+    if SHARED_CACHE_PATH:
+        try:
+            await asyncio.to_thread(delete_shared_entry, key)
+        except sqlite3.Error as e:
+            print(f"Failed to delete shared cache entry {key}: {e}")
+
+
+# Process-wide team metadata cache, team colors and logos almost never change
+TEAM_DATA_TTL_SECONDS = int(os.getenv('TEAM_DATA_TTL_SECONDS', '21600'))
+team_data_cache = {'data': None, 'expires_at': 0.0, 'version': 0}
+team_data_lock = asyncio.Lock()
+
+
+# Parses a '#RRGGBB' hex color into a discord.Color (None if it is missing or invalid)
+def parse_team_color(color_hex):
+    try:
+        return discord.Color(int(color_hex.lstrip('#'), 16))
+    except (AttributeError, ValueError):
+        print(f"Invalid color code: {color_hex}")
+        return None
+
+
+def team_data_is_fresh():
+    return team_data_cache['data'] is not None and time.monotonic() < team_data_cache['expires_at']
+
+
+# get team data from supabase, served from the cache until the TTL expires
+
+
+async def get_team_data(force_refresh=False):
+    if not force_refresh and team_data_is_fresh():
+        return team_data_cache['data']
+
+    async with team_data_lock:
+        # Another caller may have refreshed the cache while we waited
+        if not force_refresh and team_data_is_fresh():
+            return team_data_cache['data']
+
+        # A forced reload has to skip the shared copy too, or it just reads back the stale rows
+        if force_refresh:
+            await shared_invalidate('team_data')
+        team_rows, _ = await shared_fetch('team_data', TEAM_DATA_TTL_SECONDS, fetch_team_rows)
+
+        team_data = {}
+        for team in team_rows:
+            team_name = team['team_name']
+            team_data[team_name] = {
+                'color': team['color'],
+                'logo': team['logo'],
+                'discord_color': parse_team_color(team['color'])
+            }
+
+        if team_data != team_data_cache['data']:
+            team_data_cache['version'] += 1
+        team_data_cache['data'] = team_data
+        team_data_cache['expires_at'] = time.monotonic() + TEAM_DATA_TTL_SECONDS
+        print(f"Team data cache refreshed with {len(team_data)} teams")
 
     return team_data
 
 
+# Drops the cached team data so the next lookup reloads it
+def invalidate_team_data():
+    team_data_cache['expires_at'] = 0.0
+
+
+# Admin command to reload team colors and logos after they change in Supabase
+@bot.command(name='refresh_teams')
+@commands.has_permissions(administrator=True)
+async def refresh_teams(ctx):
+    invalidate_team_data()
+    team_data = await get_team_data(force_refresh=True)
+    await ctx.send(f"Team data refreshed ({len(team_data)} teams).")
+
+
+# Per-guild channel routing, stored in Supabase and cached in memory so
+# routing checks never hit the database. The ODDS/SCORES/STREAK_CHANNEL_ID
+# env vars are parsed once and used for guilds without their own setting
+GUILD_CHANNEL_KINDS = ('odds', 'scores', 'streak')
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', '10'))
+
+
+def env_channel_id(name):
+    value = os.getenv(name, '').strip()
+    return int(value) if value.isdigit() else None
+
+
+DEFAULT_CHANNEL_IDS = {kind: env_channel_id(f'{kind.upper()}_CHANNEL_ID')
+                       for kind in GUILD_CHANNEL_KINDS}
+# Reloaded periodically so the leader process sees changes made through other shards
+GUILD_SETTINGS_TTL_SECONDS = int(os.getenv('GUILD_SETTINGS_TTL_SECONDS', '300'))
+guild_settings = {'guilds': {}, 'expires_at': 0.0}
+guild_settings_lock = asyncio.Lock()
+
+
+async def get_guild_settings():
+    if time.monotonic() >= guild_settings['expires_at']:
+        async with guild_settings_lock:
+            if time.monotonic() >= guild_settings['expires_at']:
+                rows = await fetch_guild_settings_rows()
+                guild_settings['guilds'] = {row['guild_id']: row for row in rows}
+                guild_settings['expires_at'] = time.monotonic() + GUILD_SETTINGS_TTL_SECONDS
+                print(f"Loaded channel settings for {len(rows)} guilds")
+    return guild_settings['guilds']
+
+
+# Channel id for one kind of post in a guild. The env default is only used when
+# it is a channel in that same guild, other guilds have to configure their own
+async def guild_channel_id(guild, kind):
+    if guild is None:
+        return None
+    guilds = await get_guild_settings()
+    channel_id = guilds.get(guild.id, {}).get(f'{kind}_channel_id')
+    if channel_id:
+        return channel_id
+    default_channel = bot.get_channel(DEFAULT_CHANNEL_IDS[kind] or 0)
+    if default_channel is not None and default_channel.guild == guild:
+        return default_channel.id
+    return None
+
+
+def channel_not_configured(kind):
+    return f"No {kind} channel is configured for this server, use `mlb config set {kind} #channel`."
+
+
+async def set_guild_channel(guild_id, kind, channel_id):
+    guilds = await get_guild_settings()
+    row = dict(guilds.get(guild_id, {'guild_id': guild_id}))
+    row[f'{kind}_channel_id'] = channel_id
+    row['updated_at'] = datetime.now(timezone.utc).isoformat()
+    await upsert_guild_settings(row)
+    guilds[guild_id] = row
+
+
+# Every channel configured for one kind of post, plus the env default
+async def get_broadcast_channels(kind):
+    guilds = await get_guild_settings()
+    channel_ids = {settings.get(f'{kind}_channel_id') for settings in guilds.values()}
+    channel_ids.add(DEFAULT_CHANNEL_IDS[kind])
+    channel_ids.discard(None)
+    channel_ids = list(channel_ids)
+    channels = [bot.get_channel(channel_id) for channel_id in channel_ids]
+    if SHARDED:
+        # Channels in guilds owned by another process aren't cached here, but
+        # the leader can still post to them over the REST API
+        channels = [channel or bot.get_partial_messageable(channel_id)
+                    for channel, channel_id in zip(channels, channel_ids)]
+    return [channel for channel in channels if channel is not None]
+
+
+# Runs deliver(channel) for every channel concurrently, a bounded number at a time
+async def fan_out(channels, deliver):
+    semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+    async def deliver_one(channel):
+        async with semaphore:
+            try:
+                await deliver(channel)
+            except discord.HTTPException as e:
+                print(f"Failed to deliver to channel {channel.id}: {e}")
+
+    await asyncio.gather(*(deliver_one(channel) for channel in channels))
+
+
+# Sends content that was rendered once to every channel configured for the kind
+async def broadcast(kind, embeds=None, content=None):
+    channels = await get_broadcast_channels(kind)
+    if not channels:
+        print(f"No {kind} channels configured")
+        return 0
+
+    async def deliver(channel):
+        if content:
+            await send_paced(channel, content=content)
+        else:
+            await send_embeds(channel, embeds)
+
+    await fan_out(channels, deliver)
+    return len(channels)
+
+
+# Group command for per-guild channel settings
+@bot.group()
+@commands.guild_only()
+async def config(ctx):
+    if ctx.invoked_subcommand is None:
+        embed = discord.Embed(title="Channel Settings", color=discord.Color.blue())
+        for kind in GUILD_CHANNEL_KINDS:
+            channel_id = await guild_channel_id(ctx.guild, kind)
+            embed.add_field(name=kind.title(),
+                            value=f"<#{channel_id}>" if channel_id else "Not set", inline=False)
+        embed.set_footer(text="Use mlb config set <odds|scores|streak> #channel to change a channel.")
+        await ctx.send(embed=embed)
+
+
+@config.command(name='set')
+@commands.has_permissions(manage_guild=True)
+async def config_set(ctx, kind: str, channel: discord.TextChannel):
+    kind = kind.lower()
+    if kind not in GUILD_CHANNEL_KINDS:
+        await ctx.send(f"Unknown channel type. Use one of: {', '.join(GUILD_CHANNEL_KINDS)}.")
+        return
+    await set_guild_channel(ctx.guild.id, kind, channel.id)
+    await ctx.send(f"{kind.title()} posts will go to {channel.mention}.")
+
+
+@config.command(name='clear')
+@commands.has_permissions(manage_guild=True)
+async def config_clear(ctx, kind: str):
+    kind = kind.lower()
+    if kind not in GUILD_CHANNEL_KINDS:
+        await ctx.send(f"Unknown channel type. Use one of: {', '.join(GUILD_CHANNEL_KINDS)}.")
+        return
+    await set_guild_channel(ctx.guild.id, kind, None)
+    await ctx.send(f"{kind.title()} channel cleared.")
+
+
+# Per-day in-memory slate cache so streak commands only touch today's ~15 games
+SLATE_CACHE_TTL_SECONDS = int(os.getenv('SLATE_CACHE_TTL_SECONDS', '600'))
+slate_cache = {}
+
+
+# Returns {game_id: game} for one Eastern date
+async def get_games_for_date(game_date):
+    cached = slate_cache.get(game_date)
+    if cached and time.monotonic() < cached['expires_at']:
+        return cached['games']
+
+    games, _ = await shared_fetch(f'slate:{game_date.isoformat()}', SLATE_CACHE_TTL_SECONDS,
+                                  lambda: fetch_games_between(game_date, game_date))
+
+    # Only keep the slates that are still useful (today and yesterday)
+    for cached_date in list(slate_cache):
+        if cached_date < game_date - timedelta(days=1):
+            del slate_cache[cached_date]
+
+    slate_cache[game_date] = {
+        'games': {game['game_id']: game for game in games},
+        'expires_at': time.monotonic() + SLATE_CACHE_TTL_SECONDS
+    }
+    return slate_cache[game_date]['games']
+
+
+async def get_todays_games():
+    return await get_games_for_date(today_est())
+
+
+# Drops a cached slate after new games are stored for that date
+async def invalidate_slate(game_date):
+    slate_cache.pop(game_date, None)
+    await shared_invalidate(f'slate:{game_date.isoformat()}')
+
+
+# Player search index built once at startup and refreshed periodically.
+# Names are normalized (accents, punctuation, suffixes, common first-name nicknames)
+# and indexed by trigram so a lookup only scores a short list of candidates
+PLAYER_INDEX_REFRESH_HOURS = float(os.getenv('PLAYER_INDEX_REFRESH_HOURS', '6'))
+PLAYER_MATCH_CUTOFF = 0.6
+PLAYER_CANDIDATE_LIMIT = 10
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+FIRST_NAME_ALIASES = {
+    'alex': 'alexander', 'andy': 'andrew', 'ben': 'benjamin', 'bill': 'william',
+    'bob': 'robert', 'bobby': 'robert', 'chris': 'christopher', 'dan': 'daniel',
+    'danny': 'daniel', 'dave': 'david', 'ed': 'edward', 'eddie': 'edward',
+    'greg': 'gregory', 'jake': 'jacob', 'jeff': 'jeffrey', 'jim': 'james',
+    'jimmy': 'james', 'joe': 'joseph', 'joey': 'joseph', 'jon': 'jonathan',
+    'josh': 'joshua', 'matt': 'matthew', 'mike': 'michael', 'nick': 'nicholas',
+    'pete': 'peter', 'rob': 'robert', 'sam': 'samuel', 'tom': 'thomas',
+    'tommy': 'thomas', 'tony': 'anthony', 'will': 'william', 'zach': 'zachary',
+    'zack': 'zachary'
+}
+PLAYER_NICKNAMES = {
+    'big dumper': 'cal raleigh',
+    'el mago': 'javier baez',
+    'polar bear': 'pete alonso',
+    'shotime': 'shohei ohtani',
+    'vladdy': 'vladimir guerrero jr',
+}
+
+player_index = {'entries': [], 'trigrams': {}, 'exact': {}, 'built_at': None}
+player_index_lock = asyncio.Lock()
+
+
+def normalize_player_name(name):
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r"['.]", '', text)
+    words = [word for word in re.sub(r'[^a-z0-9]+', ' ', text).split()
+             if word not in NAME_SUFFIXES]
+    if words:
+        words[0] = FIRST_NAME_ALIASES.get(words[0], words[0])
+    return ' '.join(words)
+
+
+def name_trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_player_index(players):
+    entries = []
+    trigrams = {}
+    exact = {}
+    for player in players:
+        normalized = normalize_player_name(player['player_name'])
+        grams = name_trigrams(normalized)
+        entry_id = len(entries)
+        entries.append((normalized, len(grams), player))
+        exact.setdefault(normalized, entry_id)
+        for gram in grams:
+            trigrams.setdefault(gram, []).append(entry_id)
+
+    return {'entries': entries, 'trigrams': trigrams, 'exact': exact, 'built_at': time.monotonic()}
+
+
+async def refresh_player_index(force=True):
+    async with player_index_lock:
+        # Concurrent first lookups queue up here, only the first one loads the table
+        if not force and player_index['built_at'] is not None:
+            return
+        players, _ = await shared_fetch(
+            'players', PLAYER_INDEX_REFRESH_HOURS * 3600, fetch_all_players)
+        player_index.update(build_player_index(players))
+        print(f"Player index built with {len(players)} players")
+
+
+@tasks.loop(hours=PLAYER_INDEX_REFRESH_HOURS)
+async def refresh_player_index_task():
+    try:
+        await refresh_player_index()
+    except Exception as e:
+        print(f"Failed to refresh player index: {e}")
+
+
+# Returns up to `limit` full player records, best match first
+def search_players(query, limit=1, cutoff=PLAYER_MATCH_CUTOFF):
+    normalized = normalize_player_name(query)
+    if normalized in PLAYER_NICKNAMES:
+        normalized = normalize_player_name(PLAYER_NICKNAMES[normalized])
+
+    entries = player_index['entries']
+    exact_id = player_index['exact'].get(normalized)
+    if exact_id is not None and limit == 1:
+        return [entries[exact_id][2]]
+
+    # Shortlist by trigram overlap (Dice coefficient), then rank the shortlist precisely
+    query_grams = name_trigrams(normalized)
+    overlaps = {}
+    for gram in query_grams:
+        for entry_id in player_index['trigrams'].get(gram, ()):
+            overlaps[entry_id] = overlaps.get(entry_id, 0) + 1
+
+    shortlist = heapq.nlargest(
+        PLAYER_CANDIDATE_LIMIT, overlaps.items(),
+        key=lambda item: 2 * item[1] / (len(query_grams) + entries[item[0]][1]))
+
+    # Same scoring as difflib.get_close_matches: query cached as seq2, cheap upper bounds first
+    import difflib
+    matcher = difflib.SequenceMatcher()
+    matcher.set_seq2(normalized)
+    scored = []
+    for entry_id, _ in shortlist:
+        matcher.set_seq1(entries[entry_id][0])
+        if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff:
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scored.append((ratio, entry_id))
+    scored.sort(reverse=True)
+
+    return [entries[entry_id][2] for _, entry_id in scored[:limit]]
+
+
+async def find_player(name):
+    if player_index['built_at'] is None:
+        await refresh_player_index(force=False)
+    matches = search_players(name)
+    return matches[0] if matches else None
+
+
+# Statsapi cache: player name -> MLB id (persisted on the players row) and
+# (player_id, group, type, options) -> stat payload. All statsapi calls run off the event loop
+STATS_SEASON_TTL_SECONDS = int(os.getenv('STATS_SEASON_TTL_SECONDS', '900'))
+STATS_CAREER_TTL_SECONDS = int(os.getenv('STATS_CAREER_TTL_SECONDS', '86400'))
+STATS_CACHE_MAX_ENTRIES = 2000
+mlb_id_cache = {}
+stats_cache = {}
+stats_in_flight = {}
+
+
+async def resolve_mlb_id(player_info):
+    player_name = player_info['player_name']
+    mlb_id = player_info.get('mlb_id') or mlb_id_cache.get(player_name)
+    if mlb_id:
+        return mlb_id
+
+    results = await asyncio.to_thread(statsapi_call, 'lookup_player', player_name)
+    if not results:
+        return None
+
+    mlb_id = results[0]['id']
+    mlb_id_cache[player_name] = mlb_id
+    player_info['mlb_id'] = mlb_id  # the indexed record is shared, so later lookups see it
+
+    try:
+        await update_player(player_name, {'mlb_id': mlb_id})
+    except Exception as e:
+        print(f"Failed to store MLB id for {player_name}: {e}")
+
+    return mlb_id
+
+
+# Stat splits for any stats type through the person hydrate, so lastXGames
+# (limit) and byDateRange (startDate/endDate) options reach the API
+def fetch_player_stat_splits(player_id, group, stat_type, options):
+    hydrate_options = ''.join(f",{name}={value}" for name, value in options)
+    response = statsapi_call('get', 'person', {
+        'personId': player_id,
+        'hydrate': f"stats(group=[{group}],type=[{stat_type}]{hydrate_options},sportId=1)"
+    })
+
+    splits = []
+    for stat in response['people'][0].get('stats', []):
+        for split in stat['splits']:
+            splits.append({
+                'type': stat['type']['displayName'],
+                'group': stat['group']['displayName'],
+                'season': split.get('season'),
+                'team': split.get('team', {}).get('name'),
+                'position': split.get('position', {}).get('abbreviation'),
+                'split': split.get('split', {}).get('code'),
+                'stats': split['stat']
+            })
+    return {'stats': splits}
+
+
+# Season stats expire quickly, career and year-by-year stats on a long TTL;
+# concurrent requests for the same key share one statsapi call
+async def get_player_stats(player_id, group, stat_type, **options):
+    options = tuple(sorted(options.items()))
+    key = (player_id, group, stat_type, options)
+    cached = stats_cache.get(key)
+    if cached and time.monotonic() < cached['expires_at']:
+        return cached['stats']
+
+    if key in stats_in_flight:
+        return await asyncio.shield(stats_in_flight[key])
+
+    future = asyncio.ensure_future(asyncio.to_thread(
+        fetch_player_stat_splits, player_id, group, stat_type, options))
+    stats_in_flight[key] = future
+    try:
+        stats = await future
+    finally:
+        stats_in_flight.pop(key, None)
+
+    if len(stats_cache) >= STATS_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for stale_key in [k for k, v in stats_cache.items() if v['expires_at'] <= now]:
+            del stats_cache[stale_key]
+
+    ttl = STATS_CAREER_TTL_SECONDS if stat_type in (
+        'career', 'yearByYear') else STATS_SEASON_TTL_SECONDS
+    stats_cache[key] = {'stats': stats, 'expires_at': time.monotonic() + ttl}
+    return stats
+
+
 # Gets the baseball odds from the API
 
 
-def get_baseball_odds(api_key):
+async def get_baseball_odds(api_key):
     base_url = "https://api.the-odds-api.com/v4/sports/baseball_mlb/odds/"
 
     params = {
@@ -102,65 +1058,295 @@ def get_baseball_odds(api_key):
         'apiKey': api_key,
         'bookmakers': 'fanduel,draftkings'
     }
-    response = requests.get(base_url, params=params)
+    response = await http_get(base_url, params=params)
+    if response is None:
+        return []
+    record_odds_quota(response)
     if response.status_code != 200:
         print(f"Failed to get odds: {response.status_code}, {response.text}")
         return []
     return response.json()
 
 
-# Task loop to fetch and display MLB odds daily
+# Odds API quota as reported by the headers of the most recent response
+odds_api_quota = {'remaining': None, 'used': None, 'last': None, 'updated_at': None}
 
 
-@tasks.loop(hours=24)
-async def daily_odds():
-    print("daily_odds task started")
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    print(f"Current EST time: {est_now.strftime('%Y-%m-%d %I:%M %p EST')}")
-    if est_now.hour == 6 and est_now.minute == 0:
-        print("It's 06:00 AM EST, fetching odds...")
-        channel = bot.get_channel(int(os.getenv('ODDS_CHANNEL_ID')))
-        if channel:
-            await send_odds(channel)
-        else:
-            print("Channel not found")
+def record_odds_quota(response):
+    if 'x-requests-remaining' not in response.headers:
+        return
+    odds_api_quota['remaining'] = response.headers.get('x-requests-remaining')
+    odds_api_quota['used'] = response.headers.get('x-requests-used')
+    odds_api_quota['last'] = response.headers.get('x-requests-last')
+    odds_api_quota['updated_at'] = datetime.now(timezone.utc)
+
+
+# League-wide odds snapshot shared by send_odds, daily_games and prop lookups.
+# Fetched at most once per freshness window, concurrent callers share one in-flight fetch
+ODDS_SNAPSHOT_MAX_AGE_SECONDS = int(
+    os.getenv('ODDS_SNAPSHOT_MAX_AGE_SECONDS', '300'))
+odds_snapshot = {'data': None, 'fetched_at': None,
+                 'fetched_monotonic': 0.0, 'version': 0}
+odds_snapshot_in_flight = None
+
+
+async def refresh_odds_snapshot(api_key, max_age):
+    global odds_snapshot_in_flight
+    try:
+        odds_data, age = await shared_fetch(
+            'odds_snapshot', max_age, lambda: fetch_and_record_odds(api_key))
+        # An empty response may be a failed fetch, so don't replace a good snapshot with it
+        if odds_data or odds_snapshot['data'] is None:
+            # The version only moves when the odds change, it keys the rendered embeds
+            if odds_data != odds_snapshot['data']:
+                odds_snapshot['version'] += 1
+            odds_snapshot['data'] = odds_data
+            odds_snapshot['fetched_at'] = datetime.now(timezone.utc) - timedelta(seconds=age)
+            odds_snapshot['fetched_monotonic'] = time.monotonic() - age
+        return odds_snapshot['data']
+    finally:
+        odds_snapshot_in_flight = None
+
+
+async def get_odds_snapshot(api_key, max_age=ODDS_SNAPSHOT_MAX_AGE_SECONDS):
+    global odds_snapshot_in_flight
+    if odds_snapshot['data'] is not None and \
+            time.monotonic() - odds_snapshot['fetched_monotonic'] < max_age:
+        return odds_snapshot['data']
+
+    if odds_snapshot_in_flight is None:
+        odds_snapshot_in_flight = asyncio.ensure_future(
+            refresh_odds_snapshot(api_key, max_age))
+    return await asyncio.shield(odds_snapshot_in_flight)
+
+
+# Append-only line movement history (SQLite). Every upstream odds response is
+# recorded, but only the outcomes whose price or point changed since the last
+# recorded value get a new (timestamp, price, point) row
+ODDS_HISTORY_DB_PATH = os.getenv('ODDS_HISTORY_DB_PATH', 'odds_history.db')
+odds_history_lock = threading.Lock()
+odds_history_last = {}
+
+
+def open_odds_history_db():
+    connection = sqlite3.connect(ODDS_HISTORY_DB_PATH, timeout=30)
+    connection.execute("""
+        create table if not exists odds_events (
+            event_id text primary key,
+            away_team text not null,
+            home_team text not null,
+            commence_time text not null
+        )
+    """)
+    connection.execute("""
+        create table if not exists odds_history (
+            event_id text not null,
+            bookmaker text not null,
+            market text not null,
+            outcome text not null,
+            recorded_at real not null,
+            price real,
+            point real
+        )
+    """)
+    connection.execute(
+        "create index if not exists odds_history_event_idx on odds_history (event_id, recorded_at)")
+    return connection
+
+
+# Stores the changed outcomes of one odds response, returns how many rows were appended
+def record_odds_history(odds_data, recorded_at):
+    with odds_history_lock, closing(open_odds_history_db()) as connection, connection:
+        # The last recorded value per outcome is loaded once per process
+        if not odds_history_last:
+            rows = connection.execute("""
+                select event_id, bookmaker, market, outcome, price, point from odds_history
+                where rowid in (select max(rowid) from odds_history
+                                group by event_id, bookmaker, market, outcome)
+            """)
+            for event_id, bookmaker, market, outcome, price, point in rows:
+                odds_history_last[(event_id, bookmaker, market, outcome)] = (price, point)
+
+        events = []
+        deltas = []
+        for game in odds_data:
+            events.append((game['id'], game['away_team'], game['home_team'], game['commence_time']))
+            for bookmaker in game['bookmakers']:
+                for market in bookmaker['markets']:
+                    for outcome in market['outcomes']:
+                        key = (game['id'], bookmaker['key'], market['key'], outcome['name'])
+                        value = (outcome['price'], outcome.get('point'))
+                        if odds_history_last.get(key) != value:
+                            odds_history_last[key] = value
+                            deltas.append(key + (recorded_at,) + value)
+
+        connection.executemany("insert or ignore into odds_events values (?, ?, ?, ?)", events)
+        connection.executemany("insert into odds_history values (?, ?, ?, ?, ?, ?, ?)", deltas)
+    return len(deltas)
+
+
+async def fetch_and_record_odds(api_key):
+    odds_data = await get_baseball_odds(api_key)
+    if odds_data:
+        try:
+            deltas = await asyncio.to_thread(record_odds_history, odds_data, time.time())
+            print(f"Odds history: {deltas} line changes recorded")
+        except sqlite3.Error as e:
+            print(f"Failed to record odds history: {e}")
+    return odds_data
+
+
+# Events on an Eastern date involving the team, with their history rows in time order
+def load_odds_movement(team, game_date):
+    pattern = f"%{team.lower()}%"
+    with closing(open_odds_history_db()) as connection:
+        events = connection.execute("""
+            select event_id, away_team, home_team, commence_time from odds_events
+            where lower(away_team) like ? or lower(home_team) like ?
+        """, (pattern, pattern)).fetchall()
+        events = [event for event in events if convert_to_est(event[3]).date() == game_date]
+        movement = []
+        for event in events:
+            rows = connection.execute("""
+                select bookmaker, market, outcome, recorded_at, price, point from odds_history
+                where event_id = ? order by recorded_at
+            """, (event[0],)).fetchall()
+            movement.append((event, rows))
+    return movement
+
+
+def format_odds_line(market, price, point):
+    line = f"{'+' if price > 0 else ''}{price:g}"
+    if point is not None:
+        point_sign = '+' if market == 'spreads' and point > 0 else ''
+        line = f"{point_sign}{point:g} ({line})"
+    return line
+
+
+# Command to show the remaining Odds API quota and the age of the odds snapshot
+@bot.command(name='quota')
+async def odds_quota(ctx):
+    embed = discord.Embed(title="Odds API Quota", color=discord.Color.blue())
+    embed.add_field(name="Requests Remaining",
+                    value=odds_api_quota['remaining'] or "Unknown", inline=True)
+    embed.add_field(name="Requests Used",
+                    value=odds_api_quota['used'] or "Unknown", inline=True)
+    embed.add_field(name="Last Request Cost",
+                    value=odds_api_quota['last'] or "Unknown", inline=True)
+    if odds_snapshot['fetched_at']:
+        age = datetime.now(timezone.utc) - odds_snapshot['fetched_at']
+        embed.add_field(name="Odds Snapshot",
+                        value=f"Version {odds_snapshot['version']}, {int(age.total_seconds() // 60)} minutes old", inline=False)
+    await ctx.send(embed=embed)
+
+
+# Rendered embeds for each view, keyed by the version of the data they were
+# built from, so manual commands and multi-channel broadcasts reuse them
+rendered_views = {}
+
+
+def render_view(view, key, render):
+    cached = rendered_views.get(view)
+    if cached is not None and cached['key'] == key:
+        return cached['value']
+    value = render()
+    rendered_views[view] = {'key': key, 'value': value}
+    return value
 
 
 # Command to fetch and display MLB odds manually
-@bot.command(name='odds')
+@bot.group(name='odds', invoke_without_command=True)
 async def fetch_odds(ctx):
-    channel = bot.get_channel(int(os.getenv('ODDS_CHANNEL_ID')))
+    channel = bot.get_channel(await guild_channel_id(ctx.guild, 'odds') or 0)
     if channel:
         await send_odds(channel)
     else:
-        await ctx.send("Channel not found")
+        await ctx.send(channel_not_configured('odds'))
+
+
+# Opening vs current line for each book and market of today's game(s) for a team,
+# answered from the local odds history
+@fetch_odds.command(name='movement')
+async def odds_movement(ctx, *, team: str):
+    movement = await asyncio.to_thread(load_odds_movement, team, today_est())
+    if not movement:
+        await ctx.send(f"No odds history found for {team.title()} today.")
+        return
+
+    embeds = []
+    for (event_id, away_team, home_team, commence_time), rows in movement:
+        history = {}
+        for bookmaker, market, outcome, recorded_at, price, point in rows:
+            history.setdefault((bookmaker, market), {}).setdefault(
+                outcome, []).append((recorded_at, price, point))
+
+        embed = discord.Embed(
+            title=f"{away_team} @ {home_team} Line Movement",
+            description=f"Commence Time: {convert_to_est(commence_time).strftime('%I:%M %p')} EST",
+            color=discord.Color.blue()
+        )
+        for (bookmaker, market), outcomes in sorted(history.items()):
+            lines = []
+            for outcome, points in outcomes.items():
+                opening, current = points[0], points[-1]
+                changes = len(points) - 1
+                lines.append(f"{outcome}: {format_odds_line(market, opening[1], opening[2])} → "
+                             f"{format_odds_line(market, current[1], current[2])} ({changes} change{'s' if changes != 1 else ''})")
+            market_name = {'h2h': 'Head to Head', 'totals': 'Totals', 'spreads': 'Spreads'}.get(market, market)
+            embed.add_field(name=f"{bookmaker.title()} - {market_name}", value="\n".join(lines), inline=False)
+        updated = datetime.fromtimestamp(rows[-1][3], EASTERN) if rows else None
+        if updated:
+            embed.set_footer(text=f"Last change recorded {updated.strftime('%I:%M %p')} ET")
+        embeds.append(embed)
+
+    await send_embeds(ctx, embeds)
+
+
+# Functions to fetch and send odds
+
+
+async def send_odds(destination):
+    try:
+        embeds, notice = await build_odds_embeds()
+    except RuntimeError as e:
+        await destination.send(str(e))
+        return
+    if notice:
+        await destination.send(notice)
+    else:
+        await send_embeds(destination, embeds)
 
 
-# Function to fetch and send odds
+async def broadcast_odds():
+    embeds, notice = await build_odds_embeds()
+    await broadcast('odds', embeds=embeds, content=notice)
 
 
-async def send_odds(ctx):
+# Renders the odds embeds once, returns (embeds, notice) where notice explains an empty slate.
+# Raises RuntimeError when the odds can't be fetched, so the scheduled broadcast is retried
+async def build_odds_embeds():
     api_key = os.getenv('ODDS_API_KEY')
     if not api_key:
-        await ctx.send("API key not found. Please set ODDS_API_KEY in the .env file.")
-        return
+        raise RuntimeError("API key not found. Please set ODDS_API_KEY in the .env file.")
 
-    odds_data = get_baseball_odds(api_key)
+    odds_data = await get_odds_snapshot(api_key)
 
     if not odds_data:
-        await ctx.send("No odds data found.")
-        return
+        raise RuntimeError("No odds data found.")
 
     today = datetime.now(timezone.utc).date()
+    return render_view('odds', (odds_snapshot['version'], today),
+                       lambda: render_odds_embeds(odds_data, today))
+
+
+def render_odds_embeds(odds_data, today):
     games_today = [game for game in odds_data if convert_to_est(
         game['commence_time']).date() == today]
 
     if not games_today:
-        await ctx.send("No games today.")
-        return
+        return [], "No games today."
 
+    embeds = []
     for game in games_today:
         est_time = convert_to_est(game['commence_time'])
         embed = discord.Embed(
@@ -198,81 +1384,111 @@ async def send_odds(ctx):
                     embed.add_field(
                         name=f"{bookmaker['title']} - {market_name}", value=outcomes, inline=False)
 
-        await ctx.send(embed=embed)
-
-
-# Set the initial start time for the daily odds task
+        embeds.append(embed)
 
-
-@daily_odds.before_loop
-async def before_daily_odds():
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    target_time = est_now.replace(hour=6, minute=0, second=0, microsecond=0)
-    if est_now >= target_time:
-        target_time += timedelta(days=1)
-    await discord.utils.sleep_until(target_time)
+    return embeds, None
 
 
 # Gets the baseball scores from the API
-def get_baseball_scores(api_key):
+async def get_baseball_scores(api_key):
     base_url = "https://api.the-odds-api.com/v4/sports/baseball_mlb/scores/"
     params = {
         'dateFormat': 'iso',
         'daysFrom': '1',
         'apiKey': api_key
     }
-    response = requests.get(base_url, params=params)
+    response = await http_get(base_url, params=params)
+    if response is None:
+        return []
+    record_odds_quota(response)
     if response.status_code != 200:
         print(f"Failed to get scores: {response.status_code}, {response.text}")
         return []
     return response.json()
 
-# Task loop to fetch and display MLB scores daily
 
+# Scores snapshot for the results posts, versioned like the odds snapshot
+SCORES_SNAPSHOT_MAX_AGE_SECONDS = int(
+    os.getenv('SCORES_SNAPSHOT_MAX_AGE_SECONDS', '300'))
+scores_snapshot = {'data': None, 'fetched_monotonic': 0.0, 'version': 0}
+scores_snapshot_in_flight = None
 
-@tasks.loop(hours=24)
-async def daily_scores_task():
-    print("daily_scores_task started")
-    await bot.wait_until_ready()
-    now = datetime.now(pytz.utc)
-    est_now = now.astimezone(pytz.timezone('US/Eastern'))  # Adjusted for EST
-    print(f"Current EST time: {est_now.strftime('%Y-%m-%d %I:%M %p EST')}")
-    if est_now.hour == 6 and est_now.minute == 00:
-        print("It's 06:00 AM EST, fetching scores...")
-        channel = bot.get_channel(int(os.getenv('SCORES_CHANNEL_ID')))
-        if channel:
-            await send_results(channel)
-        else:
-            print("Channel not found")
+
+async def refresh_scores_snapshot(api_key, max_age):
+    global scores_snapshot_in_flight
+    try:
+        scores_data, age = await shared_fetch(
+            'scores_snapshot', max_age, lambda: get_baseball_scores(api_key))
+        if scores_data or scores_snapshot['data'] is None:
+            if scores_data != scores_snapshot['data']:
+                scores_snapshot['version'] += 1
+            scores_snapshot['data'] = scores_data
+            scores_snapshot['fetched_monotonic'] = time.monotonic() - age
+        return scores_snapshot['data']
+    finally:
+        scores_snapshot_in_flight = None
+
+
+async def get_scores_snapshot(api_key, max_age=SCORES_SNAPSHOT_MAX_AGE_SECONDS):
+    global scores_snapshot_in_flight
+    if scores_snapshot['data'] is not None and \
+            time.monotonic() - scores_snapshot['fetched_monotonic'] < max_age:
+        return scores_snapshot['data']
+
+    if scores_snapshot_in_flight is None:
+        scores_snapshot_in_flight = asyncio.ensure_future(
+            refresh_scores_snapshot(api_key, max_age))
+    return await asyncio.shield(scores_snapshot_in_flight)
 
 # Command to fetch and display MLB results manually
 
 
 @bot.command(name='results')
 async def fetch_results(ctx):
-    channel = bot.get_channel(int(os.getenv('SCORES_CHANNEL_ID')))
+    channel = bot.get_channel(await guild_channel_id(ctx.guild, 'scores') or 0)
     if channel:
         await send_results(channel)
     else:
-        await ctx.send("Channel not found.")
+        await ctx.send(channel_not_configured('scores'))
 
-# Function to fetch and send scores
+# Functions to fetch and send scores
 
 
-async def send_results(channel):
+async def send_results(destination):
+    try:
+        embeds, notice = await build_results_embeds()
+    except RuntimeError as e:
+        await destination.send(str(e))
+        return
+    if notice:
+        await destination.send(notice)
+    else:
+        await send_embeds(destination, embeds)
+
+
+async def broadcast_results():
+    embeds, notice = await build_results_embeds()
+    await broadcast('scores', embeds=embeds, content=notice)
+
+
+# Raises RuntimeError when the scores can't be fetched, so the scheduled broadcast is retried
+async def build_results_embeds():
     print("Fetching scores...")
     api_key = os.getenv('ODDS_API_KEY')
     if not api_key:
-        await channel.send("API key not found. Please set ODDS_API_KEY in the .env file.")
-        return
+        raise RuntimeError("API key not found. Please set ODDS_API_KEY in the .env file.")
 
-    scores_data = get_baseball_scores(api_key)
+    scores_data = await get_scores_snapshot(api_key)
     if not scores_data:
-        await channel.send("No scores data found.")
-        return
+        raise RuntimeError("No scores data found.")
+
+    # Fetch team data from Supabase
+    team_data = await get_team_data()
+    return render_view('results', (scores_snapshot['version'], team_data_cache['version']),
+                       lambda: render_results_embeds(scores_data, team_data))
 
+
+def render_results_embeds(scores_data, team_data):
     completed_games = {
         game['id']: {
             'commence_time': game['commence_time'],
@@ -309,10 +1525,8 @@ async def send_results(channel):
             'loser': loser
         }
 
-    # Fetch team data from Supabase
-    team_data = get_team_data()
-
-    # Send embedded messages with the scores
+    # Build embedded messages with the scores
+    embeds = []
     for key, value in results.items():
         team1_name = value['team1_name']
         team2_name = value['team2_name']
@@ -340,120 +1554,289 @@ async def send_results(channel):
 
         if 'logo' in winning_team_info:
             embed.set_thumbnail(url=winning_team_info['logo'])
-        if 'color' in winning_team_info:
-            embed.color = discord.Color(
-                int(winning_team_info['color'][1:], 16))
+        if winning_team_info.get('discord_color'):
+            embed.color = winning_team_info['discord_color']
+
+        embeds.append(embed)
+
+    return embeds, None
+
+
+# Live scores: poll the MLB schedule while games are in progress and edit one
+# message per game, only when its score, inning or status actually changes
+LIVE_POLL_SECONDS = int(os.getenv('LIVE_POLL_SECONDS', '30'))
+LIVE_IDLE_POLL_SECONDS = int(os.getenv('LIVE_IDLE_POLL_SECONDS', '900'))
+LIVE_UPCOMING_STATUSES = ('Scheduled', 'Pre-Game')
+LIVE_FINAL_STATUSES = ('Final', 'Game Over', 'Completed Early',
+                       'Postponed', 'Cancelled', 'Suspended')
+# games maps game_id -> {'date': schedule date it was polled under, 'key': live_game_key}
+live_scores = {'games': {}, 'messages': {}}
+
+
+def live_status_state(status):
+    if status.startswith(LIVE_FINAL_STATUSES):
+        return 'final'
+    if status in LIVE_UPCOMING_STATUSES:
+        return 'upcoming'
+    return 'live'
 
-        await channel.send(embed=embed)
 
+def live_game_state(game):
+    return live_status_state(game.get('status', ''))
 
-# Set the initial start time for the daily scores task
 
+# The parts of a game that are worth a message edit when they change
+def live_game_key(game):
+    return (game.get('status'), game.get('away_score'), game.get('home_score'),
+            game.get('inning_state'), game.get('current_inning'))
 
-@daily_scores_task.before_loop
-async def before_daily_scores_task():
-    print("Setting initial start time for daily_scores task")
+
+# Today's slate, plus any earlier date that still has a tracked game in progress
+def live_poll_dates():
+    today = today_est()
+    dates = {today}
+    for entry in live_scores['games'].values():
+        if entry['date'] != today and live_status_state(entry['key'][0] or '') != 'final':
+            dates.add(entry['date'])
+    return sorted(dates)
+
+
+# Returns {date: games} for every date still being polled
+async def fetch_live_games():
+    games_by_date = {}
+    for poll_date in live_poll_dates():
+        games_by_date[poll_date] = await asyncio.to_thread(
+            statsapi_call, 'schedule', date=poll_date.strftime('%m/%d/%Y'))
+    return games_by_date
+
+
+def build_live_score_embed(game, team_data):
+    away_name, home_name = game['away_name'], game['home_name']
+    away_score, home_score = game.get('away_score', 0), game.get('home_score', 0)
+    if live_game_state(game) == 'live' and game.get('current_inning'):
+        status = f"{game.get('inning_state', '')} {game['current_inning']}".strip()
+    else:
+        status = game.get('status', '')
+
+    embed = discord.Embed(
+        title=f"{away_name} @ {home_name}",
+        description=status,
+        color=discord.Color.blue()
+    )
+    embed.add_field(name=away_name, value=f"Score: {away_score}", inline=True)
+    embed.add_field(name=home_name, value=f"Score: {home_score}", inline=True)
+
+    if away_score != home_score:
+        leader_info = team_data.get(
+            away_name if away_score > home_score else home_name, {})
+        if 'logo' in leader_info:
+            embed.set_thumbnail(url=leader_info['logo'])
+        if leader_info.get('discord_color'):
+            embed.color = leader_info['discord_color']
+    return embed
+
+
+# Edit the game's existing message, or post one if it has none yet (or it was deleted)
+async def post_live_score(channel, game, embed):
+    messages = live_scores['messages'].setdefault(game['game_id'], {})
+    message = messages.get(channel.id)
+    if message is not None:
+        try:
+            await acquire_send_token(channel.id)
+            await message.edit(embed=embed)
+            return
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            print(f"Failed to edit live score for {game['game_id']}: {e}")
+            return
+    messages[channel.id] = await send_paced(channel, embed=embed)
+
+
+# Returns the games whose key changed since the last poll
+def diff_live_games(games_by_date):
+    changed = []
+    for poll_date, games in games_by_date.items():
+        for game in games:
+            key = live_game_key(game)
+            entry = live_scores['games'].get(game['game_id'])
+            if entry is not None and entry['key'] == key:
+                continue
+            live_scores['games'][game['game_id']] = {'date': poll_date, 'key': key}
+            state = live_game_state(game)
+            # Finals only get posted to close out a game we were already tracking
+            if state == 'live' or (state == 'final' and game['game_id'] in live_scores['messages']):
+                changed.append(game)
+    return changed
+
+
+# Drop earlier dates once every one of their games is final (and has had its final edit)
+def prune_live_games(games_by_date):
+    today = today_est()
+    finished = {poll_date for poll_date, games in games_by_date.items()
+                if poll_date < today and all(live_game_state(game) == 'final' for game in games)}
+    finished.update(entry['date'] for entry in live_scores['games'].values()
+                    if entry['date'] < today and entry['date'] not in games_by_date)
+    for game_id, entry in list(live_scores['games'].items()):
+        if entry['date'] in finished:
+            del live_scores['games'][game_id]
+            live_scores['messages'].pop(game_id, None)
+
+
+# Fast while a game is live, slow until the next first pitch, off once every game is done
+def next_live_poll_interval(games):
+    states = [live_game_state(game) for game in games]
+    if 'live' in states:
+        return LIVE_POLL_SECONDS
+    upcoming = [datetime.fromisoformat(game['game_datetime'].replace('Z', '+00:00'))
+                for game in games if live_game_state(game) == 'upcoming' and game.get('game_datetime')]
+    if not upcoming:
+        return None
+    until_first_pitch = (min(upcoming) - datetime.now(timezone.utc)).total_seconds()
+    return int(min(max(until_first_pitch, LIVE_POLL_SECONDS), LIVE_IDLE_POLL_SECONDS))
+
+
+@tasks.loop(seconds=LIVE_POLL_SECONDS)
+async def live_scores_task():
+    try:
+        games_by_date = await fetch_live_games()
+    except Exception as e:
+        print(f"Failed to fetch live scores: {e}")
+        return
+
+    changed = diff_live_games(games_by_date)
+    if changed:
+        channels = await get_broadcast_channels('scores')
+        team_data = await get_team_data()
+        for game in changed:
+            embed = build_live_score_embed(game, team_data)
+            await fan_out(channels, lambda channel: post_live_score(channel, game, embed))
+    prune_live_games(games_by_date)
+
+    games = [game for day_games in games_by_date.values() for game in day_games]
+
+    interval = next_live_poll_interval(games)
+    if interval is None:
+        print("No live or upcoming games, stopping live score polling")
+        live_scores_task.stop()
+    elif interval != live_scores_task.seconds:
+        live_scores_task.change_interval(seconds=interval)
+
+
+@live_scores_task.before_loop
+async def before_live_scores_task():
     await bot.wait_until_ready()
-    now = datetime.now(pytz.utc)
-    est_now = now.astimezone(pytz.timezone('US/Eastern'))  # Adjusted for EST
-    target_time = est_now.replace(hour=6, minute=00, second=0, microsecond=0)
-    if est_now >= target_time:
-        target_time += timedelta(days=1)
-    print(f"Sleeping until {target_time.astimezone(
-        pytz.timezone('US/Eastern')).strftime('%Y-%m-%d %I:%M %p EST')}")
-    await discord.utils.sleep_until(target_time)
 
 
-async def daily_games():
+def start_live_scores():
+    if live_scores_task.is_running():
+        return False
+    live_scores_task.change_interval(seconds=LIVE_POLL_SECONDS)
+    live_scores_task.start()
+    return True
+
+
+# Command to start live score polling and show what it is tracking
+@bot.command(name='live')
+async def live(ctx):
+    if not IS_LEADER:
+        await ctx.send("Live scores are polled by the leader shard process.")
+        return
+    started = start_live_scores()
+    live_count = sum(1 for entry in live_scores['games'].values()
+                     if live_status_state(entry['key'][0] or '') == 'live')
+    state = "Started" if started else "Running"
+    interval = int(live_scores_task.seconds)
+    await ctx.send(f"{state}: live score polling every {interval}s, {live_count} game(s) in progress.")
+
+
+# Raises RuntimeError when the odds can't be fetched, so the scheduler retries
+# instead of leaving the day without a slate to pick from
+async def daily_games(destination=None):
     api_key = os.getenv('ODDS_API_KEY')
     if not api_key:
-        print("API key not found. Please set ODDS_API_KEY in the .env file.")
-        return
+        raise RuntimeError("API key not found. Please set ODDS_API_KEY in the .env file.")
 
-    odds_data = get_baseball_odds(api_key)
+    odds_data = await get_odds_snapshot(api_key)
     if not odds_data:
-        print("No games data found.")
-        return
+        raise RuntimeError("No games data found.")
 
     today = datetime.now(timezone.utc).date()
     games_today = [game for game in odds_data if convert_to_est(
         game['commence_time']).date() == today]
 
     if not games_today:
-        print("No games today.")
-        return
-
-    embed = discord.Embed(
-        title="Today's MLB Games",
-        color=discord.Color.blue()
-    )
+        print("No games today.")
+        return
 
     for game in games_today:
         game_id = game['id']
         team1 = game['away_team']
         team2 = game['home_team']
         commence_time_est = convert_to_est(game['commence_time'])
-        formatted_commence_time = commence_time_est.strftime(
-            '%m-%d-%y %I:%M %p')  # Format to 12-hour time with AM/PM
 
-        existing_game = supabase.table('games').select(
-            '*').eq('game_id', game_id).execute()
-        if not existing_game.data:
-            supabase.table('games').insert({
+        existing_game = await fetch_game(game_id)
+        if not existing_game:
+            await insert_game({
                 'game_id': game_id,
                 'team1': team1,
                 'team2': team2,
                 # Store as EST in ISO format
                 'commence_time': commence_time_est.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                # Eastern game date used by the date-scoped slate query
+                'game_date': commence_time_est.date().isoformat(),
                 'result': None  # Result will be updated later
-            }).execute()
+            })
+            await invalidate_slate(commence_time_est.date())
+
+    embed = render_view('daily_games', (odds_snapshot['version'], today),
+                        lambda: render_daily_games_embed(games_today))
+
+    # Scheduled runs post the slate to every streak channel, manual runs to one
+    if destination is not None:
+        await send_paced(destination, embed=embed)
+    else:
+        await broadcast('streak', embeds=[embed])
+
+
+def render_daily_games_embed(games_today):
+    embed = discord.Embed(
+        title="Today's MLB Games",
+        color=discord.Color.blue()
+    )
 
+    for game in games_today:
+        formatted_commence_time = convert_to_est(game['commence_time']).strftime(
+            '%m-%d-%y %I:%M %p')  # Format to 12-hour time with AM/PM
         embed.add_field(
-            name=f"{team1} vs {team2}",
+            name=f"{game['away_team']} vs {game['home_team']}",
             value=f"Commence Time: {formatted_commence_time}",
             inline=False
         )
-
-    channel = bot.get_channel(int(os.getenv('STREAK_CHANNEL_ID')))
-    if channel:
-        await channel.send(embed=embed)
-    else:
-        print("Channel not found")
+    return embed
 
 # Create a separate command function to call `daily_games` manually
 
 
 @bot.command(name='daily_games')
 async def daily_games_command(ctx):
-    await daily_games()
-
-
-@tasks.loop(hours=24)
-async def daily_games_task():
-    print("daily_games_task started")
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    print(f"Current EST time: {est_now.strftime('%Y-%m-%d %I:%M %p EST')}")
-    if est_now.hour == 6 and est_now.minute == 0:
-        print("It's 06:00 AM EST, fetching today's games...")
-        await daily_games()  # Call the daily_games function
-
-
-@daily_games_task.before_loop
-async def before_daily_games_task():
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    target_time = est_now.replace(hour=6, minute=0, second=0, microsecond=0)
-    if est_now >= target_time:
-        target_time += timedelta(days=1)
-    await discord.utils.sleep_until(target_time)
+    channel = bot.get_channel(await guild_channel_id(ctx.guild, 'streak') or 0)
+    if channel:
+        try:
+            await daily_games(channel)
+        except RuntimeError as e:
+            await ctx.send(f"Could not post today's games: {e}")
+    else:
+        await ctx.send(channel_not_configured('streak'))
 
 
 def is_streak_channel():
     async def predicate(ctx):
-        return ctx.channel.id == int(os.getenv('STREAK_CHANNEL_ID'))
+        channel_id = await guild_channel_id(ctx.guild, 'streak')
+        if channel_id is None:
+            await ctx.send(channel_not_configured('streak'))
+            return False
+        return ctx.channel.id == channel_id
     return commands.check(predicate)
 
 
@@ -474,8 +1857,9 @@ async def streak_help(ctx):
         "3. **mlb streak reset** - Reset your current pick (only before the game starts).",
         "4. **mlb streak profile [user]** - View your profile or mention a user to view their profile.",
         "5. **mlb streak current** - View your current streak and pick status.",
-        "6. **mlb streak leaderboard** - View the top streaks on the leaderboard.",
-        "7. **mlb streak help** - Display this help message."
+        "6. **mlb streak leaderboard [page]** - View the top streaks on the leaderboard.",
+        "7. **mlb streak rank [user]** - View your rank or mention a user to view their rank.",
+        "8. **mlb streak help** - Display this help message."
     ]
     embed = discord.Embed(
         title="Streak Game Help",
@@ -492,20 +1876,21 @@ async def register(ctx):
     username = str(ctx.author)
 
     # Check if the user is already registered
-    existing_user = supabase.table('users').select(
-        '*').eq('user_id', user_id).execute()
-    if existing_user.data:
+    existing_user = await fetch_user(user_id)
+    if existing_user:
         await ctx.send(f"{username.title()}, you are already registered.")
         return
 
     # Register the user
-    supabase.table('users').insert({
+    await insert_user({
         'user_id': user_id,
         'username': username,
         'streak': 0,
         'current_pick': None,
         'current_game_id': None
-    }).execute()
+    })
+
+    update_ranking(user_id, username, 0)
 
     await ctx.send(f"{username.title()}, you have been registered for the streak game!")
 
@@ -524,22 +1909,18 @@ async def pick(ctx, *, team_name: str):
         return
 
     # Check if the user is registered
-    existing_user = supabase.table('users').select(
-        '*').eq('user_id', user_id).execute()
-    if not existing_user.data:
+    existing_user = await fetch_user(user_id)
+    if not existing_user:
         await ctx.send(f"{username.title()}, you are not registered. Please register first using `mlb streak register`.")
         return
 
     # Fetch the user's current pick and game ID
-    user_data = existing_user.data[0]
+    user_data = existing_user
     current_game_id = user_data.get('current_game_id')
     current_pick = user_data.get('current_pick')
 
-    # Fetch today's games from the database
-    today = datetime.now(timezone.utc).date()
-    games_today = supabase.table('games').select('*').execute().data
-    games_today = {game['game_id']: game for game in games_today if convert_to_est(
-        game['commence_time']).date() == today}
+    # Fetch today's games from the database (date-scoped, cached per day)
+    games_today = await get_todays_games()
 
     if current_game_id:
         current_game = games_today.get(current_game_id)
@@ -587,10 +1968,10 @@ async def pick(ctx, *, team_name: str):
 
     # Update the user's current pick and current game ID
     game_id = selected_game['game_id']
-    supabase.table('users').update({
+    await update_user(user_id, {
         'current_pick': user_pick,
         'current_game_id': game_id
-    }).eq('user_id', user_id).execute()
+    })
 
     await ctx.send(f"{username.title()}, you have selected the {user_pick} for today, good luck!")
 
@@ -602,14 +1983,13 @@ async def reset_pick(ctx):
     username = str(ctx.author)
 
     # Check if the user is registered
-    existing_user = supabase.table('users').select(
-        '*').eq('user_id', user_id).execute()
-    if not existing_user.data:
+    existing_user = await fetch_user(user_id)
+    if not existing_user:
         await ctx.send(f"{username.title()}, you are not registered. Please register first using `mlb streak register`.")
         return
 
     # Fetch the user's current pick and game ID
-    user_data = existing_user.data[0]
+    user_data = existing_user
     current_game_id = user_data.get('current_game_id')
     current_pick = user_data.get('current_pick')
 
@@ -617,11 +1997,8 @@ async def reset_pick(ctx):
         await ctx.send(f"{username.title()}, you do not have an active pick to reset.")
         return
 
-    # Fetch today's games from the database
-    today = datetime.now(timezone.utc).date()
-    games_today = supabase.table('games').select('*').execute().data
-    games_today = {game['game_id']: game for game in games_today if convert_to_est(
-        game['commence_time']).date() == today}
+    # Fetch today's games from the database (date-scoped, cached per day)
+    games_today = await get_todays_games()
 
     selected_game = games_today.get(current_game_id)
     if not selected_game:
@@ -635,10 +2012,10 @@ async def reset_pick(ctx):
         return
 
     # Reset the user's current pick and game ID
-    supabase.table('users').update({
+    await update_user(user_id, {
         'current_pick': None,
         'current_game_id': None
-    }).eq('user_id', user_id).execute()
+    })
 
     await ctx.send(f"{username.title()}, your pick has been reset. You can now make a new pick for today's games.")
 
@@ -653,22 +2030,18 @@ async def view(ctx, member: discord.Member = None):
     username = str(member)
 
     # Check if the user is registered
-    existing_user = supabase.table('users').select(
-        '*').eq('user_id', user_id).execute()
-    if not existing_user.data:
+    existing_user = await fetch_user(user_id)
+    if not existing_user:
         await ctx.send(f"{username.title()}, this user is not registered.")
         return
 
-    user_data = existing_user.data[0]
+    user_data = existing_user
     current_pick = user_data.get('current_pick')
     current_game_id = user_data.get('current_game_id')
     streak = user_data.get('streak', 0)
 
-    # Fetch today's games from the database
-    today = datetime.now(timezone.utc).date()
-    games_today = supabase.table('games').select('*').execute().data
-    games_today = {game['game_id']: game for game in games_today if convert_to_est(
-        game['commence_time']).date() == today}
+    # Fetch today's games from the database (date-scoped, cached per day)
+    games_today = await get_todays_games()
 
     selected_game = games_today.get(current_game_id)
     if selected_game:
@@ -695,17 +2068,104 @@ async def view(ctx, member: discord.Member = None):
     await ctx.send(embed=embed)
 
 
+# In-process streak ranking: sorted (-streak, user_id) keys plus each user's entry.
+# Loaded once at startup and then updated incrementally by register and settlement.
+# When sharded, users also register through other processes, so the leader
+# reloads it periodically like the guild settings
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_RELOAD_SECONDS = int(os.getenv('LEADERBOARD_RELOAD_SECONDS', '300'))
+leaderboard_ranking = {'keys': [], 'users': {}, 'loaded': False, 'expires_at': 0.0}
+leaderboard_ranking_lock = asyncio.Lock()
+
+
+async def load_ranking():
+    rows = await fetch_ranking_rows()
+    leaderboard_ranking['users'] = {
+        row['user_id']: {'username': row.get('username') or 'Unknown User',
+                         'streak': row.get('streak') or 0}
+        for row in rows
+    }
+    leaderboard_ranking['keys'] = sorted(
+        (-entry['streak'], user_id) for user_id, entry in leaderboard_ranking['users'].items())
+    leaderboard_ranking['loaded'] = True
+    leaderboard_ranking['expires_at'] = time.monotonic() + LEADERBOARD_RELOAD_SECONDS
+    print(f"Leaderboard ranking loaded with {len(rows)} users")
+
+
+def update_ranking(user_id, username, streak):
+    if not leaderboard_ranking['loaded']:
+        return
+    keys = leaderboard_ranking['keys']
+    users = leaderboard_ranking['users']
+
+    previous = users.get(user_id)
+    if previous is not None:
+        old_key = (-previous['streak'], user_id)
+        index = bisect.bisect_left(keys, old_key)
+        if index < len(keys) and keys[index] == old_key:
+            del keys[index]
+
+    bisect.insort(keys, (-streak, user_id))
+    users[user_id] = {'username': username or 'Unknown User', 'streak': streak}
+
+
+async def refresh_ranking_if_stale():
+    if not SHARDED or not leaderboard_ranking['loaded'] or \
+            time.monotonic() < leaderboard_ranking['expires_at']:
+        return
+    async with leaderboard_ranking_lock:
+        if time.monotonic() < leaderboard_ranking['expires_at']:
+            return
+        try:
+            await load_ranking()
+        except Exception as e:
+            # Keep serving the current ranking and try again after another interval
+            leaderboard_ranking['expires_at'] = time.monotonic() + LEADERBOARD_RELOAD_SECONDS
+            print(f"Failed to reload leaderboard ranking: {e}")
+
+
+# Returns a page of (rank, username, streak) rows, from memory when the ranking is loaded
+async def get_leaderboard_page(page):
+    await refresh_ranking_if_stale()
+    offset = (page - 1) * LEADERBOARD_PAGE_SIZE
+    if leaderboard_ranking['loaded']:
+        users = leaderboard_ranking['users']
+        keys = leaderboard_ranking['keys'][offset:offset + LEADERBOARD_PAGE_SIZE]
+        rows = [users[user_id] for _, user_id in keys]
+    else:
+        rows = await fetch_top_users(offset, LEADERBOARD_PAGE_SIZE)
+
+    return [(offset + idx, row.get('username') or 'Unknown User', row.get('streak') or 0)
+            for idx, row in enumerate(rows, start=1)]
+
+
+# Rank is 1 + the number of users with a strictly higher streak (ties share a rank)
+async def get_user_rank(user_id):
+    await refresh_ranking_if_stale()
+    entry = leaderboard_ranking['users'].get(user_id)
+    if entry is not None:
+        rank = bisect.bisect_left(
+            leaderboard_ranking['keys'], (-entry['streak'],)) + 1
+        return rank, entry['streak']
+
+    # Not in memory (or no ranking loaded here), so ask the database
+    user = await fetch_user(user_id)
+    if user is None:
+        return None, None
+    streak = user.get('streak') or 0
+    return await count_users_above_streak(streak) + 1, streak
+
+
 @ streak.command(name='leaderboard')
 @ is_streak_channel()
-async def leaderboard(ctx):
-    # Fetch all users and sort by streak
-    users_data = supabase.table('users').select('*').execute()
-    if not users_data.data:
-        await ctx.send("No users found.")
-        return
+async def leaderboard(ctx, page: int = 1):
+    page = max(page, 1)
 
-    sorted_users = sorted(
-        users_data.data, key=lambda x: x.get('streak', 0), reverse=True)
+    # Fetch only the requested page of users ordered by streak
+    rows = await get_leaderboard_page(page)
+    if not rows:
+        await ctx.send("No users found." if page == 1 else f"No users on page {page}.")
+        return
 
     # Create an embed message for the leaderboard
     embed = discord.Embed(
@@ -713,455 +2173,602 @@ async def leaderboard(ctx):
         color=discord.Color.gold()
     )
 
-    # Show top 10 users
-    for idx, user in enumerate(sorted_users[:10], start=1):
-        user_name = user.get('username', 'Unknown User')
-        streak = user.get('streak', 0)
+    # Show 10 users per page
+    for idx, user_name, streak in rows:
         embed.add_field(name=f"{idx}. {user_name.title()}",
                         value=f"Streak: {streak}", inline=False)
 
+    if leaderboard_ranking['loaded']:
+        total_pages = max(
+            (len(leaderboard_ranking['keys']) - 1) // LEADERBOARD_PAGE_SIZE + 1, 1)
+        embed.set_footer(text=f"Page {page} of {total_pages}")
+    else:
+        embed.set_footer(text=f"Page {page}")
+
     await ctx.send(embed=embed)
 
 
+@ streak.command(name='rank')
+@ is_streak_channel()
+async def rank(ctx, member: discord.Member = None):
+    if member is None:
+        member = ctx.author
+    username = str(member)
+
+    user_rank, streak = await get_user_rank(member.id)
+    if user_rank is None:
+        await ctx.send(f"{username.title()}, this user is not registered.")
+        return
+
+    await ctx.send(f"{username.title()} is ranked #{user_rank} with a streak of {streak}.")
+
+
 @ streak.command(name='check_winners')
 async def check_winners(ctx):
-    await check_and_update_winners(ctx.channel)
+    try:
+        await check_and_update_winners(ctx.channel)
+    except RuntimeError as e:
+        await ctx.send(f"Could not settle yesterday's picks: {e}")
 
 
-async def check_and_update_winners(channel):
+# Settles yesterday's picks with a handful of bulk queries instead of
+# one select/update per completed game and per user who made a pick.
+# Raises RuntimeError when there is nothing to settle from, so the scheduler retries
+async def check_and_update_winners(channel=None):
     api_key = os.getenv('ODDS_API_KEY')
     if not api_key:
-        print("API key not found. Please set ODDS_API_KEY in the .env file.")
-        return
+        raise RuntimeError("API key not found. Please set ODDS_API_KEY in the .env file.")
 
-    scores_data = get_baseball_scores(api_key)
+    timings = {}
+    phase_start = time.perf_counter()
+
+    def end_phase(name):
+        nonlocal phase_start
+        now = time.perf_counter()
+        timings[name] = now - phase_start
+        phase_start = now
+
+    scores_data = await get_baseball_scores(api_key)
+    end_phase('fetch scores')
     if not scores_data:
-        print("No scores data found.")
-        return
+        raise RuntimeError("No scores data found.")
 
-    yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+    yesterday = today_est() - timedelta(days=1)
     completed_games = {game['id']: game for game in scores_data if game['completed']
                        and convert_to_est(game['commence_time']).date() == yesterday}
 
-    print(f"Completed games from yesterday: {completed_games}")
+    print(f"Completed games from yesterday: {list(completed_games)}")
 
+    winners = {}
     for game_id, game_info in completed_games.items():
-        print(f"Processing game ID: {game_id}")
         scores = game_info['scores']
+        if not scores or len(scores) < 2:
+            continue  # Ensure both team scores are available
         team1_name, team2_name = scores[0]['name'], scores[1]['name']
         team1_score, team2_score = scores[0]['score'], scores[1]['score']
-        winner = team1_name if int(team1_score) > int(
+        winners[game_id] = team1_name if int(team1_score) > int(
             team2_score) else team2_name
 
-        pick_game = supabase.table('games').select(
-            '*').eq('game_id', game_id).execute()
-        if pick_game.data:
-            pick_game = pick_game.data[0]
-            if pick_game['result'] is None:
-                print(f"Updating result for game ID: {
-                      game_id} with winner: {winner}")
-                supabase.table('games').update({
-                    'result': winner
-                }).eq('game_id', game_id).execute()
-            else:
-                print(f"Game ID: {game_id} already has a result: {
-                      pick_game['result']}")
-        else:
+    # Load every completed game in one query and write all new results in one upsert
+    stored_games = {game['game_id']: game for game in await fetch_games_by_ids(list(winners))}
+    end_phase('load games')
+
+    games_to_update = []
+    for game_id, winner in winners.items():
+        stored_game = stored_games.get(game_id)
+        if not stored_game:
             print(f"No game found in database for game ID: {game_id}")
+        elif stored_game['result'] is None:
+            stored_game['result'] = winner
+            games_to_update.append(stored_game)
+        else:
+            print(f"Game ID: {game_id} already has a result: {
+                  stored_game['result']}")
+
+    await upsert_games(games_to_update)
+    end_phase('update game results')
+    print(f"Updated results for {len(games_to_update)} games")
+
+    # Now load every user with a pending pick, plus any picked games we don't have yet
+    users_data = await fetch_users_with_picks()
+    missing_game_ids = {user['current_game_id'] for user in users_data
+                        if user['current_game_id'] and user['current_game_id'] not in stored_games}
+    for game in await fetch_games_by_ids(list(missing_game_ids)):
+        stored_games[game['game_id']] = game
+    end_phase('load picks')
+
+    # Compute the new streaks in memory
+    users_to_update = []
+    for user in users_data:
+        pick_game = stored_games.get(user['current_game_id'])
+        if not pick_game:
+            print(f"No game found in database for game ID: {
+                  user['current_game_id']}")
+            continue
+        result = pick_game['result']
+        if not result:
+            print(f"No result found for game ID: {pick_game['game_id']}")
+            continue
+
+        new_streak = user['streak'] + 1 if user['current_pick'] == result else 0
+        user['streak'] = new_streak
+        user['current_pick'] = None  # Reset the pick after processing
+        users_to_update.append(user)
+    end_phase('compute streaks')
+
+    await update_user_streaks(users_to_update)
+    for user in users_to_update:
+        update_ranking(user['user_id'], user.get('username'), user['streak'])
+    end_phase('update users')
+
+    report = ', '.join(f"{name} {seconds:.2f}s" for name,
+                       seconds in timings.items())
+    print(f"Settled {len(users_to_update)} picks across {
+          len(winners)} games ({report})")
+    return timings
+
+
+# Central scheduler: each job runs once per Eastern day (DST-aware) at its
+# scheduled time, after the jobs it depends on, with a little jitter so the
+# jobs don't hit the upstream APIs together. Last-run dates are persisted in
+# Supabase, so after a restart any run missed earlier in the day catches up
+SCHEDULER_JITTER_SECONDS = float(os.getenv('SCHEDULER_JITTER_SECONDS', '30'))
+SCHEDULER_MAX_SLEEP_SECONDS = 3600
+# A failed job is retried with exponential backoff (until it succeeds that day)
+SCHEDULER_RETRY_BASE_SECONDS = int(os.getenv('SCHEDULER_RETRY_BASE_SECONDS', '120'))
+SCHEDULER_RETRY_MAX_SECONDS = 3600
+scheduled_jobs = {}
+# last_runs only holds successful runs, failures holds {name: {date, attempts, retry_at}}
+scheduler_state = {'last_runs': {}, 'failures': {}, 'task': None}
+
+
+def scheduled_job(name, hour, minute, after=()):
+    def decorator(func):
+        scheduled_jobs[name] = {'name': name, 'hour': hour, 'minute': minute,
+                                'after': tuple(after), 'func': func}
+        return func
+    return decorator
+
+
+def job_run_time(job, day):
+    return EASTERN.localize(datetime(day.year, day.month, day.day, job['hour'], job['minute']))
+
+
+# Jobs in dependency order
+def ordered_jobs():
+    ordered = []
+    seen = set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for dependency in scheduled_jobs[name]['after']:
+            visit(dependency)
+        ordered.append(scheduled_jobs[name])
 
-    # Now check and update the users' streaks
-    users_data = supabase.table('users').select('*').execute()
-    for user in users_data.data:
-        current_pick = user['current_pick']
-        current_pick_game_id = user['current_game_id']
-        if current_pick:
-            pick_game = supabase.table('games').select(
-                '*').eq('game_id', current_pick_game_id).execute()
-            if pick_game.data:
-                pick_game = pick_game.data[0]
-                game_id = pick_game['game_id']
-                result = pick_game['result']
-                if result:
-                    print(f"Processing user {
-                          user['user_id']} with current pick: {current_pick}")
-                    new_streak = user['streak'] + \
-                        1 if user['current_pick'] == result else 0
-
-                    # Update user's streak and reset current pick
-                    print(f"Updating user ID: {
-                          user['user_id']} with new streak: {new_streak}")
-                    supabase.table('users').update({
-                        'streak': new_streak,
-                        'current_pick': None  # Reset the pick after processing
-                    }).eq('user_id', user['user_id']).execute()
-
-                else:
-                    print(f"No result found for game ID: {game_id}")
-            else:
-                print(f"No game found in database for game ID: {current_pick}")
+    for name in scheduled_jobs:
+        visit(name)
+    return ordered
 
 
-@ tasks.loop(hours=24)
-async def daily_check_winners_task():
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    print(f"Current EST time: {est_now.strftime('%Y-%m-%d %I:%M %p EST')}")
-    if est_now.hour == 6 and est_now.minute == 0:
-        print("It's 06:00 AM EST, checking and updating winners...")
-        channel = bot.get_channel(int(os.getenv('STREAK_CHANNEL_ID')))
-        if channel:
-            await check_and_update_winners(channel)
-        else:
-            print("Channel not found")
+# Today's failure record for a job, None if it hasn't failed today
+def job_failure(job, today):
+    failure = scheduler_state['failures'].get(job['name'])
+    return failure if failure and failure['date'] == today else None
 
 
-@ daily_check_winners_task.before_loop
-async def before_daily_check_winners_task():
-    print("Setting initial start time for daily_check_winners_task")
-    await bot.wait_until_ready()
-    now = datetime.now(timezone.utc)
-    est_now = now.astimezone(timezone(timedelta(hours=-4)))
-    target_time = est_now.replace(hour=6, minute=0, second=0, microsecond=0)
-    if est_now >= target_time:
-        target_time += timedelta(days=1)
-    print(f"Sleeping until {target_time.astimezone(
-        timezone(timedelta(hours=-4))).strftime('%Y-%m-%d %I:%M %p EST')}")
-    await discord.utils.sleep_until(target_time)
+def job_next_run(job, now):
+    today = now.date()
+    if scheduler_state['last_runs'].get(job['name']) == today:
+        return job_run_time(job, today + timedelta(days=1))
+    failure = job_failure(job, today)
+    if failure:
+        return failure['retry_at']
+    return job_run_time(job, today)
 
 
-@ bot.command()
-async def seasonstats(ctx, first_name: str, last_name: str, stat_category: str):
+# Runs one job; only a successful run is marked (and persisted) as done for today
+async def run_scheduled_job(job, today):
+    await asyncio.sleep(random.uniform(0, SCHEDULER_JITTER_SECONDS))
+    print(f"Running scheduled job {job['name']}")
+    started = time.perf_counter()
+    try:
+        await job['func']()
+    except Exception as e:
+        failure = job_failure(job, today) or {'date': today, 'attempts': 0}
+        failure['attempts'] += 1
+        delay = min(SCHEDULER_RETRY_BASE_SECONDS * 2 ** (failure['attempts'] - 1),
+                    SCHEDULER_RETRY_MAX_SECONDS)
+        failure['retry_at'] = datetime.now(EASTERN) + timedelta(seconds=delay)
+        scheduler_state['failures'][job['name']] = failure
+        print(f"Scheduled job {job['name']} failed (attempt {failure['attempts']}), "
+              f"retrying in {delay}s: {e}")
+        return False
+    print(f"Scheduled job {job['name']} finished in {time.perf_counter() - started:.2f}s")
+
+    scheduler_state['last_runs'][job['name']] = today
+    scheduler_state['failures'].pop(job['name'], None)
     try:
-        full_name = f"{first_name} {last_name}".lower()
+        await upsert_scheduler_run(job['name'], today, 'ok')
+    except Exception as e:
+        print(f"Failed to store run marker for {job['name']}: {e}")
+    return True
 
-        # Fetch all player names from Supabase
-        all_players = supabase.table('players').select('player_name').execute()
-        player_names = [player['player_name'] for player in all_players.data]
 
-        # Find the closest match for the player name
-        closest_matches = difflib.get_close_matches(
-            full_name, player_names, n=1, cutoff=0.6)
-        if not closest_matches:
-            await ctx.send(f"Sorry, no match found for {full_name.title()}. Please try again with a different player name.")
-            return
+async def run_scheduler():
+    await bot.wait_until_ready()
+    try:
+        scheduler_state['last_runs'] = await fetch_scheduler_runs()
+    except Exception as e:
+        print(f"Failed to load scheduler run markers: {e}")
+
+    while True:
+        now = datetime.now(EASTERN)
+        today = now.date()
+        for job in ordered_jobs():
+            if scheduler_state['last_runs'].get(job['name']) == today:
+                continue
+            if datetime.now(EASTERN) < job_run_time(job, today):
+                continue
+            failure = job_failure(job, today)
+            if failure and datetime.now(EASTERN) < failure['retry_at']:
+                continue
+            # Dependents wait until their prerequisites have succeeded today
+            if any(scheduler_state['last_runs'].get(dependency) != today for dependency in job['after']):
+                continue
+            await run_scheduled_job(job, today)
+
+        # Sleep until the next job is due, waking at least hourly to resync
+        now = datetime.now(EASTERN)
+        next_run = min(job_next_run(job, now) for job in scheduled_jobs.values())
+        next_run = max(next_run, now + timedelta(seconds=60))
+        next_run = min(next_run, now + timedelta(seconds=SCHEDULER_MAX_SLEEP_SECONDS))
+        await discord.utils.sleep_until(next_run)
+
+
+@scheduled_job('check_winners', hour=6, minute=0)
+async def check_winners_job():
+    await check_and_update_winners()
+
+
+# Today's games are posted only after yesterday's picks are settled
+@scheduled_job('daily_games', hour=6, minute=0, after=('check_winners',))
+async def daily_games_job():
+    await daily_games()
 
-        matched_player_name = closest_matches[0]
-        player_data = supabase.table('players').select(
-            '*').eq('player_name', matched_player_name).execute()
-        player_info = player_data.data[0]
 
-        # Get player ID from statsapi
-        player = statsapi.lookup_player(matched_player_name)
-        player_id = player[0]['id']
-        stat_category = stat_category.lower()
+@scheduled_job('odds', hour=6, minute=0)
+async def odds_job():
+    await broadcast_odds()
 
-        image_url = player_info.get('image_url', '')
-        team_raw = player_info.get('team', 'Unknown Team').split()[:-1]
-        team_parts = ' '.join(team_raw).split('-')
-        team = ' '.join(team_parts).title()
 
-        # Fetch team data from Supabase
-        team_data = get_team_data()
+@scheduled_job('results', hour=6, minute=0)
+async def results_job():
+    await broadcast_results()
 
-        # Fetch the team color from Supabase
-        team_color_hex = team_data.get(team, {}).get(
-            'color', '#000000')  # Default to black if no color found
 
-        # Print the team name and color code for debugging
-        print(f"Team: {team}, Color: {team_color_hex}")
+# Live polling stops itself once every game is final, so restart it each morning
+@scheduled_job('live_scores', hour=6, minute=0, after=('daily_games',))
+async def live_scores_job():
+    start_live_scores()
 
+
+@scheduled_job('game_log_warehouse', hour=6, minute=15, after=('daily_games',))
+async def game_log_warehouse_job():
+    await warehouse_game_logs()
+
+
+# Command to show when each scheduled job last ran and will run next
+@bot.command(name='schedule')
+async def show_schedule(ctx):
+    now = datetime.now(EASTERN)
+    embed = discord.Embed(title="Scheduled Jobs", color=discord.Color.blue())
+    for job in ordered_jobs():
+        last_run = scheduler_state['last_runs'].get(job['name'])
+        next_run = job_next_run(job, now).strftime('%Y-%m-%d %I:%M %p %Z')
+        value = f"Last run: {last_run or 'Never'}\nNext run: {next_run}"
+        failure = job_failure(job, now.date())
+        if failure:
+            value += f"\nFailed today: {failure['attempts']} attempt(s)"
+        embed.add_field(name=job['name'], value=value, inline=False)
+    await ctx.send(embed=embed)
+
+
+# Embed fields for each stat group as (field name, stat key or function of the
+# stats dict). Compiled once into getters so building an embed is one pass
+STAT_FIELDS = {
+    'hitting': (
+        ("Games Played", 'gamesPlayed'),
+        ("Home Runs", 'homeRuns'),
+        ("RBI", 'rbi'),
+        ("Groundouts", 'groundOuts'),
+        ("Airouts", 'airOuts'),
+        ("Strikeouts", 'strikeOuts'),
+        ("Runs", 'runs'),
+        ("Doubles", 'doubles'),
+        ("Triples", 'triples'),
+        ("At Bats", 'atBats'),
+        ("Hits", 'hits'),
+        ("AVG", 'avg'),
+        ("SLG", 'slg'),
+        ("OPS", 'ops'),
+        ("Total Bases", 'totalBases'),
+        ("Stolen Bases", 'stolenBases'),
+    ),
+    'fielding': (
+        ("Games Played", 'gamesPlayed'),
+        ("Innings", 'innings'),
+        ("Assists", 'assists'),
+        ("Putouts", 'putOuts'),
+        ("Errors", 'errors'),
+        ("Chances", 'chances'),
+        ("RF/Game", 'rangeFactorPerGame'),
+        ("Double Plays", 'doublePlays'),
+        ("Triple Plays", 'triplePlays'),
+    ),
+    'pitching': (
+        ("Games Played", 'gamesPlayed'),
+        ("Innings Pitched", 'inningsPitched'),
+        ("Record", lambda stats: f"{stats.get('wins', 0)}-{stats.get('losses', 0)}"),
+        ("# Pitches", 'numberOfPitches'),
+        ("ERA", 'era'),
+        ("WHIP", 'whip'),
+        ("K/9", 'strikeoutsPer9Inn'),
+        ("Groundouts", 'groundOuts'),
+        ("Airouts", 'airOuts'),
+        ("Strikeouts", 'strikeOuts'),
+        ("Hits", 'hits'),
+        ("Runs", 'runs'),
+        ("Earned Runs", 'earnedRuns'),
+        ("Doubles", 'doubles'),
+        ("Triples", 'triples'),
+        ("Home Runs", 'homeRuns'),
+    ),
+}
+STAT_TYPE_ALIASES = {
+    'season': 'season',
+    'career': 'career',
+    'last': 'lastXGames',
+    'lastxgames': 'lastXGames',
+    'range': 'byDateRange',
+    'bydaterange': 'byDateRange',
+    'years': 'yearByYear',
+    'yearbyyear': 'yearByYear',
+}
+STATS_LAST_GAMES_DEFAULT = 10
+
+
+def stat_getter(source):
+    if callable(source):
+        return source
+    return lambda stats: stats.get(source, '-')
+
+
+COMPILED_STAT_FIELDS = {
+    group: tuple((name, stat_getter(source)) for name, source in fields)
+    for group, fields in STAT_FIELDS.items()
+}
+
+
+# Title for one split, e.g. "2024 Hitting Stats" or "Last 10 Games Hitting Stats"
+def stat_split_title(player_name, group, stat_type, options, split):
+    label = {
+        'season': f"{split.get('season') or date.today().year}",
+        'career': "Career",
+        'lastXGames': f"Last {dict(options).get('limit')} Games",
+        'byDateRange': f"{dict(options).get('startDate')} to {dict(options).get('endDate')}",
+        'yearByYear': f"{split.get('season')}",
+    }[stat_type]
+    # Traded players get a split per team and fielders one per position, so name both
+    qualifiers = [value for value in (split.get('team'), split.get('position')) if value]
+    suffix = f" ({', '.join(qualifiers)})" if qualifiers else ''
+    return f"{player_name.title()}'s {label} {group.title()} Stats{suffix}"
+
+
+def build_stat_embed(title, team, team_color, image_url, group, stats):
+    embed = discord.Embed(title=title, description=f"Team: {team}", color=team_color)
+    embed.set_thumbnail(url=image_url)
+    for name, getter in COMPILED_STAT_FIELDS[group]:
+        embed.add_field(name=name, value=getter(stats), inline=True)
+    return embed
+
+
+# Parses the optional stats type arguments into (type, hydrate options) or raises ValueError
+def parse_stat_type(stat_type, args):
+    resolved = STAT_TYPE_ALIASES.get(stat_type.lower())
+    if resolved is None:
+        raise ValueError("Unknown stats type. Use season, career, last [games], range <start> <end> or years.")
+    if resolved == 'lastXGames':
+        limit = args[0] if args else str(STATS_LAST_GAMES_DEFAULT)
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError("The number of games must be a whole number of at least 1.")
+        return resolved, {'limit': int(limit)}
+    if resolved == 'byDateRange':
         try:
-            team_color = discord.Color(int(team_color_hex.lstrip('#'), 16))
+            start, end = (date.fromisoformat(arg) for arg in args)
         except ValueError:
-            print(f"Invalid color code for team {team}: {team_color_hex}")
-            team_color = discord.Color.default()
-
-        if stat_category == 'hitting':
-            stats = statsapi.player_stat_data(
-                player_id, group="[hitting]", type="season")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s {
-                    date.today().year} Hitting Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Home Runs", value=stats_[
-                            'homeRuns'], inline=True)
-            embed.add_field(name="RBI", value=stats_['rbi'], inline=True)
-            embed.add_field(name="Groundouts", value=stats_[
-                            'groundOuts'], inline=True)
-            embed.add_field(name="Airouts", value=stats_[
-                            'airOuts'], inline=True)
-            embed.add_field(name="Strikeouts", value=stats_[
-                            'strikeOuts'], inline=True)
-            embed.add_field(name="Runs", value=stats_['runs'], inline=True)
-            embed.add_field(name="Doubles", value=stats_[
-                            'doubles'], inline=True)
-            embed.add_field(name="Triples", value=stats_[
-                            'triples'], inline=True)
-            embed.add_field(name="At Bats", value=stats_[
-                            'atBats'], inline=True)
-            embed.add_field(name="Hits", value=stats_['hits'], inline=True)
-            embed.add_field(name="AVG", value=stats_['avg'], inline=True)
-            embed.add_field(name="Total Bases", value=stats_[
-                            'totalBases'], inline=True)
-            embed.add_field(name="Stolen Bases", value=stats_[
-                            'stolenBases'], inline=True)
-
-            await ctx.send(embed=embed)
-
-        elif stat_category == 'fielding':
-            stats = statsapi.player_stat_data(
-                player_id, group="[fielding]", type="season")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s {
-                    date.today().year} Fielding Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Innings", value=stats_[
-                            'innings'], inline=True)
-            embed.add_field(name="Assists", value=stats_[
-                            'assists'], inline=True)
-            embed.add_field(name="Putouts", value=stats_[
-                            'putOuts'], inline=True)
-            embed.add_field(name="Errors", value=stats_['errors'], inline=True)
-            embed.add_field(name="Chances", value=stats_[
-                            'chances'], inline=True)
-            embed.add_field(
-                name="RF/Game", value=stats_['rangeFactorPerGame'], inline=True)
-            embed.add_field(name="Double Plays", value=stats_[
-                            'doublePlays'], inline=True)
-            embed.add_field(name="Triple Plays", value=stats_[
-                            'triplePlays'], inline=True)
-
-            await ctx.send(embed=embed)
-
-        elif stat_category == 'pitching':
-            stats = statsapi.player_stat_data(
-                player_id, group="[pitching]", type="season")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s {
-                    date.today().year} Pitching Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Innings Pitched", value=stats_[
-                            'inningsPitched'], inline=True)
-            embed.add_field(name="Record", value=f"{
-                            stats_['wins']}-{stats_['losses']}", inline=True)
-            embed.add_field(name="# Pitches", value=stats_[
-                            'numberOfPitches'], inline=True)
-            embed.add_field(name="ERA", value=stats_['era'], inline=True)
-            embed.add_field(name="WHIP", value=stats_['whip'], inline=True)
-            embed.add_field(name="Groundouts", value=stats_[
-                            'groundOuts'], inline=True)
-            embed.add_field(name="Airouts", value=stats_[
-                            'airOuts'], inline=True)
-            embed.add_field(name="Strikeouts", value=stats_[
-                            'strikeOuts'], inline=True)
-            embed.add_field(name="Hits", value=stats_['hits'], inline=True)
-            embed.add_field(name="Runs", value=stats_['runs'], inline=True)
-            embed.add_field(name="Earned Runs", value=stats_[
-                            'earnedRuns'], inline=True)
-            embed.add_field(name="Doubles", value=stats_[
-                            'doubles'], inline=True)
-            embed.add_field(name="Triples", value=stats_[
-                            'triples'], inline=True)
-            embed.add_field(name="Home Runs", value=stats_[
-                            'homeRuns'], inline=True)
-
-            await ctx.send(embed=embed)
-
-    except IndexError:
+            raise ValueError("A date range needs a start and end date, e.g. `2024-04-01 2024-04-30`.")
+        return resolved, {'startDate': start.isoformat(), 'endDate': end.isoformat()}
+    return resolved, {}
+
+
+# Looks up a player and sends their stats for one group and stats type
+async def send_player_stats(ctx, full_name, stat_category, stat_type, options):
+    stat_category = stat_category.lower()
+    if stat_category not in COMPILED_STAT_FIELDS:
+        await ctx.send("Please choose a stat category: hitting, fielding or pitching.")
+        return
+
+    # Find the closest match for the player name in the player index
+    player_info = await find_player(full_name)
+    if not player_info:
+        await ctx.send(f"Sorry, no match found for {full_name.title()}. Please try again with a different player name.")
+        return
+
+    # Get player ID (stored on the player record, statsapi lookup only on first use)
+    player_id = await resolve_mlb_id(player_info)
+    if player_id is None:
         await ctx.send(f"Sorry, {full_name.title()} is not in our database! Please try again with a different player!")
+        return
+
+    stats = await get_player_stats(player_id, stat_category, stat_type, **options)
+    if not stats['stats']:
+        await ctx.send(f"Sorry, no {stat_category} stats found for {full_name.title()}.")
+        return
+
+    team_raw = player_info.get('team', 'Unknown Team').split()[:-1]
+    team = ' '.join(' '.join(team_raw).split('-')).title()
+
+    # Use the pre-parsed team color, default if no valid color found
+    team_data = await get_team_data()
+    team_color = team_data.get(team, {}).get('discord_color') or discord.Color.default()
+
+    options = tuple(sorted(options.items()))
+    embeds = [
+        build_stat_embed(stat_split_title(player_info['player_name'], stat_category, stat_type, options, split),
+                         team, team_color, player_info.get('image_url', ''), stat_category, split['stats'])
+        for split in stats['stats']
+    ]
+    await send_embeds(ctx, embeds)
+
+
+@ bot.command()
+async def seasonstats(ctx, first_name: str, last_name: str, stat_category: str):
+    await send_player_stats(ctx, f"{first_name} {last_name}".lower(), stat_category, 'season', {})
 
 
 @ bot.command()
 async def careerstats(ctx, first_name: str, last_name: str, stat_category: str):
+    await send_player_stats(ctx, f"{first_name} {last_name}".lower(), stat_category, 'career', {})
+
+
+# Stats for any type: season, career, last [games], range <start> <end>, years
+@ bot.command(name='stats')
+async def player_stats(ctx, first_name: str, last_name: str, stat_category: str, stat_type: str = 'season', *args):
     try:
-        full_name = f"{first_name} {last_name}".lower()
+        stat_type, options = parse_stat_type(stat_type, args)
+    except ValueError as e:
+        await ctx.send(str(e))
+        return
+    await send_player_stats(ctx, f"{first_name} {last_name}".lower(), stat_category, stat_type, options)
 
-        # Fetch all player names from Supabase
-        all_players = supabase.table('players').select('player_name').execute()
-        player_names = [player['player_name'] for player in all_players.data]
 
-        # Find the closest match for the player name
-        closest_matches = difflib.get_close_matches(
-            full_name, player_names, n=1, cutoff=0.6)
-        if not closest_matches:
-            await ctx.send(f"Sorry, no match found for {full_name.title()}. Please try again with a different player name.")
-            return
+# Compare command: names are matched against the in-memory player index, then
+# each player's id lookup and stats fetch run concurrently
+COMPARE_MAX_PLAYERS = 4
+COMPARE_COLUMN_WIDTH = 11
+COMPARE_FIELDING_TOTALS = ('gamesPlayed', 'assists', 'putOuts', 'errors',
+                           'chances', 'doublePlays', 'triplePlays')
 
-        matched_player_name = closest_matches[0]
-        player_data = supabase.table('players').select(
-            '*').eq('player_name', matched_player_name).execute()
-        player_info = player_data.data[0]
 
-        # Get player ID from statsapi
-        player = statsapi.lookup_player(matched_player_name)
-        player_id = player[0]['id']
-        stat_category = stat_category.lower()
+# Innings are written as whole.outs ("123.2"), so add them up in outs
+def innings_to_outs(innings):
+    whole, _, outs = str(innings or '0').partition('.')
+    return int(whole or 0) * 3 + int(outs or 0)
 
-        image_url = player_info.get('image_url', '')
-        team_raw = player_info.get('team', 'Unknown Team').split()[:-1]
-        team_parts = ' '.join(team_raw).split('-')
-        team = ' '.join(team_parts).title()
 
-        # Fetch team data from Supabase
-        team_data = get_team_data()
+# Fielding comes back one split per position, total them into one line per player
+def combine_fielding_splits(splits):
+    totals = {key: sum(int(split['stats'].get(key) or 0) for split in splits)
+              for key in COMPARE_FIELDING_TOTALS}
+    outs = sum(innings_to_outs(split['stats'].get('innings')) for split in splits)
+    totals['innings'] = f"{outs // 3}.{outs % 3}"
+    games = totals['gamesPlayed']
+    totals['rangeFactorPerGame'] = f"{(totals['putOuts'] + totals['assists']) / games:.2f}" if games else '-'
+    totals['positions'] = [split['position'] for split in splits if split.get('position')]
+    return totals
 
-        # Fetch the team color from Supabase
-        team_color_hex = team_data.get(team, {}).get(
-            'color', '#000000')  # Default to black if no color found
 
-        try:
-            team_color = discord.Color(int(team_color_hex.lstrip('#'), 16))
-        except ValueError:
-            print(f"Invalid color code for team {team}: {team_color_hex}")
-            team_color = discord.Color.default()
-
-        if stat_category == 'hitting':
-            stats = statsapi.player_stat_data(
-                player_id, group="[hitting]", type="career")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s Career Hitting Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Home Runs", value=stats_[
-                            'homeRuns'], inline=True)
-            embed.add_field(name="RBI", value=stats_['rbi'], inline=True)
-            embed.add_field(name="Groundouts", value=stats_[
-                            'groundOuts'], inline=True)
-            embed.add_field(name="Airouts", value=stats_[
-                            'airOuts'], inline=True)
-            embed.add_field(name="Strikeouts", value=stats_[
-                            'strikeOuts'], inline=True)
-            embed.add_field(name="Runs", value=stats_['runs'], inline=True)
-            embed.add_field(name="Doubles", value=stats_[
-                            'doubles'], inline=True)
-            embed.add_field(name="Triples", value=stats_[
-                            'triples'], inline=True)
-            embed.add_field(name="At Bats", value=stats_[
-                            'atBats'], inline=True)
-            embed.add_field(name="Hits", value=stats_['hits'], inline=True)
-            embed.add_field(name="AVG", value=stats_['avg'], inline=True)
-            embed.add_field(name="Total Bases", value=stats_[
-                            'totalBases'], inline=True)
-            embed.add_field(name="Stolen Bases", value=stats_[
-                            'stolenBases'], inline=True)
-
-            await ctx.send(embed=embed)
-
-        elif stat_category == 'fielding':
-            stats = statsapi.player_stat_data(
-                player_id, group="[fielding]", type="career")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s Career Fielding Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Innings", value=stats_[
-                            'innings'], inline=True)
-            embed.add_field(name="Assists", value=stats_[
-                            'assists'], inline=True)
-            embed.add_field(name="Putouts", value=stats_[
-                            'putOuts'], inline=True)
-            embed.add_field(name="Errors", value=stats_['errors'], inline=True)
-            embed.add_field(name="Chances", value=stats_[
-                            'chances'], inline=True)
-            embed.add_field(
-                name="RF/Game", value=stats_['rangeFactorPerGame'], inline=True)
-            embed.add_field(name="Double Plays", value=stats_[
-                            'doublePlays'], inline=True)
-            embed.add_field(name="Triple Plays", value=stats_[
-                            'triplePlays'], inline=True)
-
-            await ctx.send(embed=embed)
-
-        elif stat_category == 'pitching':
-            stats = statsapi.player_stat_data(
-                player_id, group="[pitching]", type="career")
-            stats_ = stats['stats'][0]['stats']
-
-            embed = discord.Embed(
-                title=f"{matched_player_name.title()}'s Career Pitching Stats",
-                description=f"Team: {team}",
-                color=team_color
-            )
-            embed.set_thumbnail(url=image_url)
-            embed.add_field(name="Games Played", value=stats_[
-                            'gamesPlayed'], inline=True)
-            embed.add_field(name="Innings Pitched", value=stats_[
-                            'inningsPitched'], inline=True)
-            embed.add_field(name="Record", value=f"{
-                            stats_['wins']}-{stats_['losses']}", inline=True)
-            embed.add_field(name="# Pitches", value=stats_[
-                            'numberOfPitches'], inline=True)
-            embed.add_field(name="ERA", value=stats_['era'], inline=True)
-            embed.add_field(name="WHIP", value=stats_['whip'], inline=True)
-            embed.add_field(name="Groundouts", value=stats_[
-                            'groundOuts'], inline=True)
-            embed.add_field(name="Airouts", value=stats_[
-                            'airOuts'], inline=True)
-            embed.add_field(name="Strikeouts", value=stats_[
-                            'strikeOuts'], inline=True)
-            embed.add_field(name="Hits", value=stats_['hits'], inline=True)
-            embed.add_field(name="Runs", value=stats_['runs'], inline=True)
-            embed.add_field(name="Earned Runs", value=stats_[
-                            'earnedRuns'], inline=True)
-            embed.add_field(name="Doubles", value=stats_[
-                            'doubles'], inline=True)
-            embed.add_field(name="Triples", value=stats_[
-                            'triples'], inline=True)
-            embed.add_field(name="Home Runs", value=stats_[
-                            'homeRuns'], inline=True)
-
-            await ctx.send(embed=embed)
-
-    except IndexError:
-        await ctx.send(f"Sorry, {full_name.title()} is not in our database! Please try again with a different player!")
+async def fetch_compare_stats(player_info, stat_category):
+    player_id = await resolve_mlb_id(player_info)
+    if player_id is None:
+        return None
+    stats = await get_player_stats(player_id, stat_category, 'season')
+    # A traded player also gets one split per team, the combined line is the one without a team
+    splits = [split for split in stats['stats'] if not split['team']] or stats['stats']
+    if not splits:
+        return None
+    if stat_category == 'fielding':
+        return combine_fielding_splits(splits)
+    return splits[0]['stats']
+
+
+# Side-by-side table with one column per player, in a code block so it lines up
+def build_compare_table(player_names, stat_category, player_stats):
+    label_width = max(len(name) for name, _ in COMPILED_STAT_FIELDS[stat_category])
+    header = ' ' * label_width + ''.join(
+        f" {name.split()[-1].title()[:COMPARE_COLUMN_WIDTH - 1]:>{COMPARE_COLUMN_WIDTH - 1}}" for name in player_names)
+    rows = [header]
+    for name, getter in COMPILED_STAT_FIELDS[stat_category]:
+        rows.append(f"{name:<{label_width}}" + ''.join(
+            f" {str(getter(stats))[:COMPARE_COLUMN_WIDTH - 1]:>{COMPARE_COLUMN_WIDTH - 1}}" for stats in player_stats))
+    return "```\n" + "\n".join(rows) + "\n```"
+
+
+@bot.command(name='compare')
+async def compare(ctx, *args):
+    if len(args) < 2 or args[-1].lower() not in COMPILED_STAT_FIELDS:
+        await ctx.send("Usage: `mlb compare <player> vs <player> [vs ...] <hitting|fielding|pitching>`")
+        return
+    stat_category = args[-1].lower()
+
+    names, current = [], []
+    for word in args[:-1]:
+        if word.lower() == 'vs':
+            names.append(' '.join(current))
+            current = []
+        else:
+            current.append(word)
+    names.append(' '.join(current))
+    names = [name.lower() for name in names if name]
+    if not 2 <= len(names) <= COMPARE_MAX_PLAYERS:
+        await ctx.send(f"Please compare between 2 and {COMPARE_MAX_PLAYERS} players, separated by `vs`.")
+        return
+
+    players = await asyncio.gather(*(find_player(name) for name in names))
+    missing = [name.title() for name, player in zip(names, players) if not player]
+    if missing:
+        await ctx.send(f"Sorry, no match found for {', '.join(missing)}. Please try again with a different player name.")
+        return
+
+    player_stats = await asyncio.gather(
+        *(fetch_compare_stats(player, stat_category) for player in players), return_exceptions=True)
+    missing = [player['player_name'].title() for player, stats in zip(players, player_stats)
+               if stats is None or isinstance(stats, Exception)]
+    if missing:
+        await ctx.send(f"Sorry, no {stat_category} stats found for {', '.join(missing)}.")
+        return
+
+    player_names = [player['player_name'] for player in players]
+    embed = discord.Embed(
+        title=f"{date.today().year} {stat_category.title()} Stats: " +
+        " vs ".join(name.title() for name in player_names),
+        description=build_compare_table(player_names, stat_category, player_stats),
+        color=discord.Color.blue()
+    )
+    if stat_category == 'fielding':
+        positions = '; '.join(f"{name.title()} {'/'.join(stats['positions']) or '-'}"
+                              for name, stats in zip(player_names, player_stats))
+        embed.set_footer(text=f"Fielding totals across all positions played: {positions}")
+    await ctx.send(embed=embed)
 
 
 # Functions for Prop Research feature
-def get_player_data(player):
+# Team name as the Odds API spells it, from the players.team slug
+def player_team_name(player_data):
+    return player_data['team'][:-7].replace('-', ' ').title()
+
+
+async def get_player_data(player):
     # get row from supabase for player
-    player_data = supabase.table('players').select(
-        '*').eq('player_name', player.title()).execute()
+    player_data = await fetch_player(player.title())
 
     # Access the data attribute directly
-    if player_data.data:
+    if player_data:
         # Access the data returned by Supabase
-        player_url = (player_data.data[0]['player_link'])
-        player_team = (player_data.data[0]['team']
-                       [:-7].replace('-', ' ').title())
+        player_url = (player_data['player_link'])
+        player_team = player_team_name(player_data)
     else:
         print(f"No data found for player: {player}")
         return None, None
@@ -1171,20 +2778,23 @@ def get_player_data(player):
     return player_team, game_log_url
 
 
-def get_players_game_id(player_team):
-    today = datetime.now().date()  # Ensure today's date is correct
-    games_data = supabase.table('games').select('*').execute()
+async def get_players_game_id(player_team):
+    todays_games = await get_todays_games()
 
-    if not games_data.data:
+    if not todays_games:
         print("No games data found.")
-        return None
 
-    todays_games = [game for game in games_data.data if datetime.strptime(
-        game['commence_time'], '%Y-%m-%dT%H:%M:%S').date() == today]
-
-    game_ids = [game['game_id'] for game in todays_games if player_team in [
+    game_ids = [game['game_id'] for game in todays_games.values() if player_team in [
         game['team1'], game['team2']]]
 
+    # Fall back to the shared odds snapshot for games not stored yet
+    api_key = os.getenv('ODDS_API_KEY')
+    if not game_ids and api_key:
+        odds_data = await get_odds_snapshot(api_key)
+        game_ids = [game['id'] for game in odds_data
+                    if player_team in [game['away_team'], game['home_team']]
+                    and convert_to_est(game['commence_time']).date() == today_est()]
+
     if not game_ids:
         print(f"No game found for {player_team} today.")
         return None
@@ -1192,41 +2802,61 @@ def get_players_game_id(player_team):
     return game_ids
 
 
-def get_player_prop_odds(player, prop, game_id, api_key):
+# Dictionary to map user-friendly prop names to API market keys
+market_identifiers = {
+    'homeruns': 'batter_home_runs',
+    'hits': 'batter_hits',
+    'rbis': 'batter_rbis',
+    'runs': 'batter_runs_scored',
+    'doubles': 'batter_doubles',
+    'triples': 'batter_triples',
+    'walks': 'batter_walks',
+    'strikeouts': 'batter_strikeouts',
+    'pitcher_strikeouts': 'pitcher_strikeouts',
+    'pitcher_hits_allowed': 'pitcher_hits_allowed',
+    'pitcher_walks': 'pitcher_walks',
+    'pitcher_earned_runs': 'pitcher_earned_runs'
+}
+
+# Markets requested together in one event odds call, so follow-up props for the
+# same game (hits, then homeruns, then RBIs) are answered from the cache
+PROP_MARKET_GROUPS = [
+    ['batter_home_runs', 'batter_hits', 'batter_rbis', 'batter_runs_scored',
+     'batter_doubles', 'batter_triples', 'batter_walks', 'batter_strikeouts'],
+    ['pitcher_strikeouts', 'pitcher_hits_allowed',
+        'pitcher_walks', 'pitcher_earned_runs'],
+]
+PROP_ODDS_TTL_SECONDS = int(os.getenv('PROP_ODDS_TTL_SECONDS', '180'))
+prop_odds_cache = {}
+prop_odds_in_flight = {}
+
+
+def market_group(market):
+    for group in PROP_MARKET_GROUPS:
+        if market in group:
+            return group
+    return [market]
+
+
+# Fetches several markets for one event in a single call.
+# Returns {market: [{'bookmaker': title, 'outcomes': [...]}, ...]} or None on failure
+async def fetch_event_odds(game_id, markets, api_key):
     base_url = f"https://api.the-odds-api.com/v4/sports/baseball_mlb/events/{
         game_id}/odds/"
 
-    # Dictionary to map user-friendly prop names to API market keys
-    market_identifiers = {
-        'homeruns': 'batter_home_runs',
-        'hits': 'batter_hits',
-        'rbis': 'batter_rbis',
-        'runs': 'batter_runs_scored',
-        'doubles': 'batter_doubles',
-        'triples': 'batter_triples',
-        'walks': 'batter_walks',
-        'strikeouts': 'batter_strikeouts',
-        'pitcher_strikeouts': 'pitcher_strikeouts',
-        'pitcher_hits_allowed': 'pitcher_hits_allowed',
-        'pitcher_walks': 'pitcher_walks',
-        'pitcher_earned_runs': 'pitcher_earned_runs'
-    }
-
-    market = market_identifiers.get(prop.lower())
-    if not market:
-        print(f"Market identifier for '{prop}' not found.")
-        return None
-
     params = {
         'dateFormat': 'iso',
         'oddsFormat': 'american',
         'apiKey': api_key,
         'regions': 'us,us2',
         'bookmakers': 'fanduel',
-        'markets': market
+        'markets': ','.join(markets)
     }
 
-    response = requests.get(base_url, params=params)
+    response = await http_get(base_url, params=params)
+    if response is None:
+        return None
+    record_odds_quota(response)
     if response.status_code == 404:
         error_message = response.json().get("message", "")
         if error_message == "Event not found. The event may have expired or the event id is invalid.":
@@ -1242,20 +2872,87 @@ def get_player_prop_odds(player, prop, game_id, api_key):
 
     odds_data = response.json()
 
-    player_odds = []
+    # Markets the book doesn't offer are cached as empty so they aren't re-requested
+    event_odds = {market: [] for market in markets}
     for bookmaker in odds_data.get('bookmakers', []):
         for market_data in bookmaker.get('markets', []):
-            if market_data['key'] == market:
-                for outcome in market_data.get('outcomes', []):
-                    if player.lower() in outcome['description'].lower():
-                        player_odds.append({
-                            'bookmaker': bookmaker['title'],
-                            'market': market_data['key'],
-                            'name': outcome['name'],
-                            'description': outcome['description'],
-                            'price': outcome['price'],
-                            'point': outcome['point']
-                        })
+            if market_data['key'] in event_odds:
+                event_odds[market_data['key']].append({
+                    'bookmaker': bookmaker['title'],
+                    'outcomes': market_data.get('outcomes', [])
+                })
+
+    return event_odds
+
+
+def cached_market_odds(game_id, market):
+    cached = prop_odds_cache.get((game_id, market))
+    if cached and time.monotonic() < cached['expires_at']:
+        return cached['bookmakers']
+    return None
+
+
+# Returns the cached bookmaker odds for one (event, market), fetching the
+# market's whole group when it's missing. Concurrent lookups share one call
+async def get_event_market_odds(game_id, market, api_key):
+    bookmakers = cached_market_odds(game_id, market)
+    if bookmakers is not None:
+        return bookmakers
+
+    if (game_id, market) not in prop_odds_in_flight:
+        markets = [m for m in market_group(market)
+                   if cached_market_odds(game_id, m) is None]
+        future = asyncio.ensure_future(
+            fetch_event_odds(game_id, markets, api_key))
+        for m in markets:
+            prop_odds_in_flight[(game_id, m)] = future
+
+        try:
+            event_odds = await future
+        finally:
+            for m in markets:
+                prop_odds_in_flight.pop((game_id, m), None)
+
+        if event_odds is None:
+            return None
+
+        expires_at = time.monotonic() + PROP_ODDS_TTL_SECONDS
+        for m, market_bookmakers in event_odds.items():
+            prop_odds_cache[(game_id, m)] = {
+                'bookmakers': market_bookmakers, 'expires_at': expires_at}
+
+        # Drop expired entries so the cache only holds today's recent lookups
+        now = time.monotonic()
+        for key in [k for k, v in prop_odds_cache.items() if v['expires_at'] <= now]:
+            del prop_odds_cache[key]
+    else:
+        await asyncio.shield(prop_odds_in_flight[(game_id, market)])
+
+    return cached_market_odds(game_id, market)
+
+
+async def get_player_prop_odds(player, prop, game_id, api_key):
+    market = market_identifiers.get(prop.lower())
+    if not market:
+        print(f"Market identifier for '{prop}' not found.")
+        return None
+
+    market_odds = await get_event_market_odds(game_id, market, api_key)
+    if market_odds is None:
+        return None
+
+    player_odds = []
+    for bookmaker in market_odds:
+        for outcome in bookmaker['outcomes']:
+            if player.lower() in outcome['description'].lower():
+                player_odds.append({
+                    'bookmaker': bookmaker['bookmaker'],
+                    'market': market,
+                    'name': outcome['name'],
+                    'description': outcome['description'],
+                    'price': outcome['price'],
+                    'point': outcome['point']
+                })
 
     if not player_odds:
         print(f"No odds found for player '{player}' in market '{prop}'.")
@@ -1263,113 +2960,435 @@ def get_player_prop_odds(player, prop, game_id, api_key):
     return player_odds
 
 
-def get_player_game_log(url, prop):
-    # Send a GET request to the URL
-    response = requests.get(url)
+# Dictionary to map props to table headers for both batters and pitchers
+prop_identifiers = {
+    'hits': 'hhits',
+    'runs': 'rruns',
+    'rbi': 'rbirunsbattedin',
+    'rbis': 'rbirunsbattedin',
+    'homeruns': 'hrhomeruns',
+    'strikeouts': 'sostrikeouts',
+    'walks': 'bbbaseonballs(walk)',
+    'doubles': '2bdoubles',
+    'triples': '3btriples',
+    'pitcher_hits_allowed': 'hhits',
+    'pitcher_earned_runs': 'erearnedruns',
+    'pitcher_walks': 'bbbaseonballs(walk)',
+    'pitcher_strikeouts': 'sostrikeouts'
+}
+
+# Game-log ingestion: the CBS game-log table is parsed once into a record with
+# every stat column and cached until the next game day. lxml is used when installed
+GAME_LOG_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+game_log_cache = {}
+
+
+def normalize_game_log_header(header):
+    return header.lower().replace(' ', '')
+
+
+# Parses the first game-log table into {'headers', 'normalized_headers', 'columns'},
+# where columns maps each normalized header to its values (most recent game first)
+def parse_game_log(content):
+    from bs4 import BeautifulSoup, SoupStrainer
+    soup = BeautifulSoup(content, GAME_LOG_PARSER,
+                         parse_only=SoupStrainer('table', class_='TableBase-table'))
+    table = soup.find('table')
+    if table is None or table.thead is None or table.tbody is None:
+        return None
 
-    # Check if the request was successful
-    if response.status_code != 200:
-        print(f"Failed to retrieve page: {response.status_code}")
-        return None, None
+    headers = [th.get_text(strip=True) for th in table.thead.find_all('th')]
+    normalized_headers = [normalize_game_log_header(
+        header) for header in headers]
+
+    columns = {header: [] for header in normalized_headers}
+    for row in table.tbody.find_all('tr'):
+        cells = [td.get_text(strip=True) for td in row.find_all('td')]
+        # Rows without a full set of cells (e.g. "did not play" rows) are skipped
+        if len(cells) < len(normalized_headers):
+            continue
+        for header, value in zip(normalized_headers, cells):
+            columns[header].append(value)
+
+    return {'headers': headers, 'normalized_headers': normalized_headers, 'columns': columns}
+
+
+# Game logs only change after games are played, so they're good until 6 AM Eastern
+def next_game_day_start():
+    now = datetime.now(EASTERN)
+    target_date = now.date() if now.hour < 6 else now.date() + timedelta(days=1)
+    return EASTERN.localize(datetime(target_date.year, target_date.month, target_date.day, 6))
+
+
+# Local game-log warehouse (SQLite). Each row holds one player's parsed log as
+# zlib-compressed JSON columns, so lookups are answered without touching CBS
+GAME_LOG_DB_PATH = os.getenv('GAME_LOG_DB_PATH', 'game_logs.db')
+GAME_LOG_WAREHOUSE_CONCURRENCY = int(
+    os.getenv('GAME_LOG_WAREHOUSE_CONCURRENCY', '3'))
+GAME_LOG_WAREHOUSE_DELAY_SECONDS = float(
+    os.getenv('GAME_LOG_WAREHOUSE_DELAY_SECONDS', '1.5'))
+
+
+def open_game_log_db():
+    connection = sqlite3.connect(GAME_LOG_DB_PATH, timeout=30)
+    connection.execute("""
+        create table if not exists game_logs (
+            url text primary key,
+            expires_at text not null,
+            etag text,
+            last_modified text,
+            data blob not null
+        )
+    """)
+    return connection
 
-    # Parse the HTML content using BeautifulSoup
-    soup = BeautifulSoup(response.content, 'html.parser')
 
-    # Find the table headers
-    try:
-        thead = soup.find('div', class_='Page-colMain').find('div', class_='TableBase').find(
-            'table', class_='TableBase-table').find('thead').find_all('th')
-    except AttributeError as e:
-        print(f"Failed to parse table headers: {e}")
-        return None, None
+def store_game_log(url, entry):
+    data = zlib.compress(json.dumps(entry['record']).encode('utf-8'))
+    with closing(open_game_log_db()) as connection, connection:
+        connection.execute(
+            "insert or replace into game_logs values (?, ?, ?, ?, ?)",
+            (url, entry['expires_at'].isoformat(), entry['etag'], entry['last_modified'], data))
+
+
+def load_game_log(url):
+    with closing(open_game_log_db()) as connection:
+        row = connection.execute(
+            "select expires_at, etag, last_modified, data from game_logs where url = ?", (url,)).fetchone()
+    if row is None:
+        return None
+    return {
+        'record': json.loads(zlib.decompress(row[3])),
+        'expires_at': datetime.fromisoformat(row[0]),
+        'etag': row[1],
+        'last_modified': row[2]
+    }
+
+
+def game_log_is_fresh(entry):
+    return entry is not None and datetime.now(timezone.utc) < entry['expires_at']
+
+
+# Returns the parsed game log for a player page from memory, then the warehouse,
+# revalidating with a conditional GET once the stored copy expires
+async def get_game_log_record(url):
+    cached = game_log_cache.get(url)
+    if cached is None:
+        cached = await asyncio.to_thread(load_game_log, url)
+        if cached:
+            game_log_cache[url] = cached
+    if game_log_is_fresh(cached):
+        return cached['record']
+
+    headers = {}
+    if cached and cached['etag']:
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached['last_modified']:
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    response = await http_get(url, headers=headers or None)
+    if response is not None and response.status_code == 304 and cached:
+        cached['expires_at'] = next_game_day_start()
+        await asyncio.to_thread(store_game_log, url, cached)
+        return cached['record']
+    if response is None or response.status_code != 200:
+        print(f"Failed to retrieve page: {
+              response.status_code if response is not None else 'no response'}")
+        return cached['record'] if cached else None
+
+    record = await asyncio.to_thread(parse_game_log, response.content)
+    if record is None:
+        print(f"Failed to parse game log table for {url}")
+        return None
 
-    headers = [th.get_text(strip=True) for th in thead]
-    print(f"Table Headers: {headers}")
-
-    # Dictionary to map props to table headers for both batters and pitchers
-    prop_identifiers = {
-        'hits': 'hhits',
-        'runs': 'rruns',
-        'rbi': 'rbirunsbattedin',
-        'homeruns': 'hrhomeruns',
-        'strikeouts': 'sostrikeouts',
-        'walks': 'bbbaseonballs(walk)',
-        'doubles': '2bdoubles',
-        'triples': '3btriples',
-        'pitcher_hits_allowed': 'hhits',
-        'pitcher_earned_runs': 'erearnedruns',
-        'pitcher_walks': 'bbbaseonballs(walk)',
-        'pitcher_strikeouts': 'sostrikeouts'
+    now = datetime.now(timezone.utc)
+    for stale_url in [u for u, v in game_log_cache.items() if v['expires_at'] <= now]:
+        del game_log_cache[stale_url]
+
+    entry = {
+        'record': record,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'expires_at': next_game_day_start()
     }
+    game_log_cache[url] = entry
+    await asyncio.to_thread(store_game_log, url, entry)
+    return record
+
+
+# Pre-fetches game logs for every indexed player on a team playing today, with
+# bounded concurrency and a politeness delay between CBS requests
+game_log_warehouse_in_flight = None
 
+
+async def run_game_log_warehouse():
+    global game_log_warehouse_in_flight
+    try:
+        return await sweep_game_logs()
+    finally:
+        game_log_warehouse_in_flight = None
+
+
+# The command and the scheduled job share one in-flight sweep instead of overlapping
+async def warehouse_game_logs():
+    global game_log_warehouse_in_flight
+    if game_log_warehouse_in_flight is None:
+        game_log_warehouse_in_flight = asyncio.ensure_future(run_game_log_warehouse())
+    return await asyncio.shield(game_log_warehouse_in_flight)
+
+
+async def sweep_game_logs():
+    todays_games = await get_todays_games()
+    teams = {game['team1'] for game in todays_games.values()} | \
+        {game['team2'] for game in todays_games.values()}
+    if not teams:
+        print("No games today, skipping game log warehouse run.")
+        return 0
+
+    if player_index['built_at'] is None:
+        await refresh_player_index(force=False)
+    players = [entry[2] for entry in player_index['entries']
+               if entry[2].get('player_link') and entry[2].get('team')
+               and player_team_name(entry[2]) in teams]
+
+    semaphore = asyncio.Semaphore(GAME_LOG_WAREHOUSE_CONCURRENCY)
+    fetched = 0
+
+    async def ingest(player):
+        nonlocal fetched
+        url = player['player_link'] + 'game-log/'
+        async with semaphore:
+            entry = game_log_cache.get(url) or await asyncio.to_thread(load_game_log, url)
+            if game_log_is_fresh(entry):
+                return
+            if await get_game_log_record(url) is not None:
+                fetched += 1
+            await asyncio.sleep(GAME_LOG_WAREHOUSE_DELAY_SECONDS +
+                                random.uniform(0, GAME_LOG_WAREHOUSE_DELAY_SECONDS))
+
+    results = await asyncio.gather(*(ingest(player) for player in players), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, Exception)]
+    print(f"Game log warehouse: {fetched} logs fetched for {
+          len(players)} players on {len(teams)} teams, {len(errors)} errors")
+    return fetched
+
+
+# Command to run the game log warehouse job manually
+@bot.command(name='warehouse_logs')
+@commands.has_permissions(administrator=True)
+async def warehouse_logs_command(ctx):
+    fetched = await warehouse_game_logs()
+    await ctx.send(f"Game log warehouse refreshed ({fetched} logs fetched).")
+
+
+async def get_player_game_log(url, prop, limit=5):
     # Normalize prop to match the table headers
     header_name = prop_identifiers.get(prop.lower())
     if not header_name:
         print(f"Property '{prop}' not found in the prop identifiers.")
         return None, None
 
-    print(f"Header Name for '{prop}': {header_name}")
-
-    # Normalize headers for comparison
-    normalized_headers = [header.lower().replace(' ', '')
-                          for header in headers]
-
-    print(f"Normalized Headers: {normalized_headers}")
-
-    # Determine the index of the column that matches the header name
-    prop_index = None
-    for index, header in enumerate(normalized_headers):
-        normalized_header_name = header_name.lower().replace(' ', '')
-        if header == normalized_header_name:
-            prop_index = index
-            break
+    record = await get_game_log_record(url)
+    if record is None:
+        return None, None
 
-    if prop_index is None:
+    prop_data = record['columns'].get(header_name)
+    if prop_data is None:
         print(f"Header '{header_name}' not found in the table headers.")
         return None, None
 
-    # Extract data from the first 5 rows
-    try:
-        data_rows = soup.find('div', class_='Page-colMain').find('div', class_='TableBase').find(
-            'table', class_='TableBase-table').find('tbody').find_all('tr')[:5]
-    except AttributeError as e:
-        print(f"Failed to parse table rows: {e}")
-        return None, None
+    # Assuming the date is in the first column
+    dates = record['columns'][record['normalized_headers'][0]]
+
+    return dates[:limit], prop_data[:limit]
 
-    dates = []
-    prop_data = []
-    for row in data_rows:
-        cells = row.find_all('td')
-        if len(cells) > prop_index:
-            # Assuming the date is in the first column
-            dates.append(cells[0].get_text(strip=True))
-            prop_data.append(cells[prop_index].get_text(strip=True))
+# Prop chart rendering uses the Agg canvas and Figure API (no pyplot global state)
+# in a small worker pool. Each worker reuses its own figure, and rendered PNGs are
+# cached by (player, prop, last game date, number of games)
+CHART_RENDER_WORKERS = int(os.getenv('CHART_RENDER_WORKERS', '2'))
+CHART_CACHE_MAX_ENTRIES = 256
+chart_executor = ThreadPoolExecutor(
+    max_workers=CHART_RENDER_WORKERS, thread_name_prefix='chart')
+chart_templates = threading.local()
+chart_cache = OrderedDict()
 
-    return dates, prop_data
 
-# Function to plot game log data
+def get_chart_figure():
+    figure = getattr(chart_templates, 'figure', None)
+    if figure is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure(figsize=(12, 6))  # Increase the size of the plot
+        FigureCanvasAgg(figure)
+        chart_templates.figure = figure
+    figure.clear()
+    return figure
 
 
-def plot_game_log_data(player_name, prop, dates, game_log_data):
+# Function to plot game log data, runs in a chart worker thread
+def render_game_log_chart(player_name, prop, dates, game_log_data):
     values = [float(data) for data in game_log_data]
 
-    plt.figure(figsize=(12, 6))  # Increase the size of the plot
-    plt.bar(dates, values, color='b')
+    figure = get_chart_figure()
+    ax = figure.add_subplot()
+    ax.bar(dates, values, color='b')
 
-    plt.title(f'{player_name} - {prop.title()
-                                 } Over Last {len(game_log_data)} Games', fontsize=16)
-    plt.xlabel('Date', fontsize=14)
-    plt.ylabel(prop.title(), fontsize=14)
-    plt.xticks(rotation=45, fontsize=12)
-    plt.yticks(fontsize=12)
-    plt.grid(False)
-    plt.tight_layout()
+    ax.set_title(f'{player_name} - {prop.title()
+                                    } Over Last {len(game_log_data)} Games', fontsize=16)
+    ax.set_xlabel('Date', fontsize=14)
+    ax.set_ylabel(prop.title(), fontsize=14)
+    ax.tick_params(axis='x', labelrotation=45, labelsize=12)
+    ax.tick_params(axis='y', labelsize=12)
+    ax.grid(False)
+    figure.tight_layout()
 
     buf = io.BytesIO()
-    plt.savefig(buf, format='png')
-    buf.seek(0)
-    plt.close()
-    return buf
+    figure.savefig(buf, format='png')
+    return buf.getvalue()
+
+
+async def plot_game_log_data(player_name, prop, dates, game_log_data):
+    key = (player_name.lower(), prop.lower(),
+           dates[0] if dates else None, len(game_log_data))
+    png = chart_cache.get(key)
+    if png is None:
+        loop = asyncio.get_running_loop()
+        png = await loop.run_in_executor(
+            chart_executor, render_game_log_chart, player_name, prop, dates, game_log_data)
+        chart_cache[key] = png
+        if len(chart_cache) > CHART_CACHE_MAX_ENTRIES:
+            chart_cache.popitem(last=False)
+    else:
+        chart_cache.move_to_end(key)
+
+    return io.BytesIO(png)
+
+
+# Prop analytics: the game-log column for a prop is turned into a NumPy array
+# (numpy is imported on first use) and summarized against the posted lines
+PROP_ANALYTICS_GAMES = int(os.getenv('PROP_ANALYTICS_GAMES', '162'))
+PROP_ROLLING_WINDOW = 5
+# statsapi group and stat key for each prop, used for the vs L/R splits
+PROP_SPLIT_STATS = {
+    'hits': ('hitting', 'hits'),
+    'runs': ('hitting', 'runs'),
+    'rbi': ('hitting', 'rbi'),
+    'rbis': ('hitting', 'rbi'),
+    'homeruns': ('hitting', 'homeRuns'),
+    'strikeouts': ('hitting', 'strikeOuts'),
+    'walks': ('hitting', 'baseOnBalls'),
+    'doubles': ('hitting', 'doubles'),
+    'triples': ('hitting', 'triples'),
+    'pitcher_hits_allowed': ('pitching', 'hits'),
+    'pitcher_earned_runs': ('pitching', 'earnedRuns'),
+    'pitcher_walks': ('pitching', 'baseOnBalls'),
+    'pitcher_strikeouts': ('pitching', 'strikeOuts')
+}
+
+
+def american_implied_probability(prices):
+    import numpy as np
+    prices = np.asarray(prices, dtype=float)
+    magnitude = np.abs(prices)
+    return np.where(prices > 0, 100 / (magnitude + 100), magnitude / (magnitude + 100))
+
+
+def game_log_number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+# Summary of a prop's game log (most recent game first) against the Over lines,
+# given as (point, price) pairs. Returns None when there are no numeric games
+def analyze_prop(values_column, opp_column, lines, limit=PROP_ANALYTICS_GAMES):
+    import numpy as np
+    values = np.array([game_log_number(value) for value in values_column[:limit]], dtype=float)
+    away = np.array([opp.startswith('@') for opp in opp_column[:len(values)]], dtype=bool) \
+        if opp_column else np.zeros(len(values), dtype=bool)
+    played = ~np.isnan(values)
+    values, away = values[played], away[played]
+    if not values.size:
+        return None
+
+    summary = {'games': int(values.size), 'average': float(values.mean()),
+               'rolling': None, 'previous_rolling': None,
+               'home_average': None, 'away_average': None, 'lines': []}
+
+    # Rolling averages run oldest to newest, the last one covers the latest games
+    if values.size >= PROP_ROLLING_WINDOW:
+        window = np.ones(PROP_ROLLING_WINDOW) / PROP_ROLLING_WINDOW
+        rolling = np.convolve(values[::-1], window, mode='valid')
+        summary['rolling'] = float(rolling[-1])
+        if rolling.size > PROP_ROLLING_WINDOW:
+            summary['previous_rolling'] = float(rolling[-1 - PROP_ROLLING_WINDOW])
+
+    if opp_column and (~away).any():
+        summary['home_average'] = float(values[~away].mean())
+    if opp_column and away.any():
+        summary['away_average'] = float(values[away].mean())
+
+    if lines:
+        points = np.array([point for point, _ in lines], dtype=float)
+        prices = np.array([price for _, price in lines], dtype=float)
+        hit_rates = (values[np.newaxis, :] > points[:, np.newaxis]).mean(axis=1)
+        implied = american_implied_probability(prices)
+        summary['lines'] = [
+            {'point': point, 'price': int(price), 'hit_rate': float(hit_rate),
+             'implied': float(probability), 'edge': float(hit_rate - probability)}
+            for point, price, hit_rate, probability in zip(points, prices, hit_rates, implied)
+        ]
+    return summary
+
+
+# Per-game rate of the prop stat this season vs left- and right-handed opponents
+async def get_handedness_rates(player_name, prop):
+    split_stat = PROP_SPLIT_STATS.get(prop.lower())
+    if not split_stat:
+        return {}
+    player_info = await find_player(player_name.lower())
+    if not player_info:
+        return {}
+    player_id = await resolve_mlb_id(player_info)
+    if player_id is None:
+        return {}
+
+    group, stat_key = split_stat
+    stats = await get_player_stats(player_id, group, 'statSplits', sitCodes='[vl,vr]')
+    rates = {}
+    for split in stats['stats']:
+        games = split['stats'].get('gamesPlayed')
+        if split.get('split') in ('vl', 'vr') and games:
+            rates[split['split']] = split['stats'].get(stat_key, 0) / games
+    return rates
+
+
+def format_prop_summary(summary, handedness, prop):
+    lines = [f"**Last {summary['games']} games:** avg {summary['average']:.2f}"]
+    if summary['rolling'] is not None:
+        trend = f"L{PROP_ROLLING_WINDOW} avg {summary['rolling']:.2f}"
+        if summary['previous_rolling'] is not None:
+            trend += f" (previous {PROP_ROLLING_WINDOW}: {summary['previous_rolling']:.2f})"
+        lines.append(trend)
+    if summary['home_average'] is not None and summary['away_average'] is not None:
+        lines.append(f"Home avg {summary['home_average']:.2f} / Away avg {summary['away_average']:.2f}")
+    if handedness:
+        opponent = 'batters' if prop.lower().startswith('pitcher_') else 'pitchers'
+        lines.append(' / '.join(
+            f"vs {'LH' if code == 'vl' else 'RH'} {opponent} {rate:.2f} per game"
+            for code, rate in sorted(handedness.items())))
+    for line in summary['lines']:
+        sign = '+' if line['price'] > 0 else ''
+        lines.append(
+            f"Over {line['point']:g} [{sign}{line['price']}]: hit {line['hit_rate']:.0%} "
+            f"vs implied {line['implied']:.0%} (edge {line['edge']:+.0%})")
+    return "\n".join(lines)
+
+
+# Number of recent games prop finder shows when none is given
+PROP_FINDER_GAMES = int(os.getenv('PROP_FINDER_GAMES', '10'))
 
 
 # Bot group for prop functions
@@ -1382,7 +3401,8 @@ async def prop(ctx):
 @prop.command(name='help')
 async def streak_help(ctx):
     help_text = [
-        "**Prop Research Command: mlb prop finder <player_name> <prop>**",
+        "**Prop Research Command: mlb prop finder <player_name> <prop> [games]**",
+        "**Slate Scan: mlb prop scan <prop> [top_n]**",
         "***Available Markets:***",
         "***1. homeruns***",
         "***2. hits***",
@@ -1409,6 +3429,10 @@ async def prop_finder(ctx, *, player_name_prop):
     api_key = os.getenv('ODDS_API_KEY')
     try:
         input_ = player_name_prop.split()
+        # An optional trailing number sets how many recent games to show
+        games = PROP_FINDER_GAMES
+        if len(input_) > 2 and input_[-1].isdigit():
+            games = max(int(input_.pop()), 1)
         player_name = ' '.join(input_[:-1])
         prop = input_[-1]
     except ValueError:
@@ -1417,7 +3441,7 @@ async def prop_finder(ctx, *, player_name_prop):
 
     print(f"Player Name: {player_name}, Prop: {prop}")
 
-    player_team, game_log_url = get_player_data(player_name)
+    player_team, game_log_url = await get_player_data(player_name)
 
     print(f"Player Team: {player_team}, Game Log URL: {game_log_url}")
 
@@ -1425,7 +3449,7 @@ async def prop_finder(ctx, *, player_name_prop):
         await ctx.send(f"No data found for player: {player_name}")
         return
 
-    game_ids = get_players_game_id(player_team)
+    game_ids = await get_players_game_id(player_team)
 
     print(f"Game IDs: {game_ids}")
 
@@ -1436,9 +3460,25 @@ async def prop_finder(ctx, *, player_name_prop):
     odds_message = f"Odds for {player_name.title()} {prop.title()}:\n"
     odds_found = False  # Flag to check if any odds are found
 
-    for game_id in game_ids:
-        prop_odds = get_player_prop_odds(player_name, prop, game_id, api_key)
-
+    # Fetch every event (e.g. both games of a doubleheader), the game log and
+    # the handedness splits concurrently
+    all_prop_odds, record, handedness = await asyncio.gather(
+        asyncio.gather(*[
+            get_player_prop_odds(player_name, prop, game_id, api_key) for game_id in game_ids
+        ]),
+        get_game_log_record(game_log_url),
+        get_handedness_rates(player_name, prop),
+        return_exceptions=True
+    )
+    if isinstance(all_prop_odds, Exception):
+        print(f"Failed to fetch prop odds: {all_prop_odds}")
+        all_prop_odds = []
+    if isinstance(handedness, Exception):
+        print(f"Failed to fetch handedness splits: {handedness}")
+        handedness = {}
+
+    over_lines = []
+    for prop_odds in all_prop_odds:
         if prop_odds:
             odds_found = True
             for odds in prop_odds:
@@ -1446,17 +3486,33 @@ async def prop_finder(ctx, *, player_name_prop):
                 # Include the name field in the message
                 odds_message += f"{odds['name']} {odds['point']
                                                   } - [{sign}{odds['price']}]\n"
+                if odds['name'] == 'Over' and (odds['point'], odds['price']) not in over_lines:
+                    over_lines.append((odds['point'], odds['price']))
 
     if not odds_found:
         odds_message += f"No odds found for player '{
             player_name}' in market '{prop}'."
 
+    # Analytics over the full game log go in the same reply as the odds
+    header_name = prop_identifiers.get(prop.lower())
+    if header_name and record and not isinstance(record, Exception) and header_name in record['columns']:
+        summary = await asyncio.to_thread(
+            analyze_prop, record['columns'][header_name], record['columns'].get('opp'), over_lines)
+        if summary:
+            summary_text = format_prop_summary(summary, handedness, prop)
+            # Discord caps a message at 2000 characters
+            if len(odds_message) + len(summary_text) < 2000:
+                odds_message += "\n" + summary_text
+            else:
+                await ctx.send(odds_message)
+                odds_message = summary_text
+
     await ctx.send(odds_message)
 
     # Fetch game log data for the specified prop
-    dates, game_log_data = get_player_game_log(game_log_url, prop)
+    dates, game_log_data = await get_player_game_log(game_log_url, prop, games)
     if game_log_data:
-        plot_buf = plot_game_log_data(player_name, prop, dates, game_log_data)
+        plot_buf = await plot_game_log_data(player_name, prop, dates, game_log_data)
 
         file = discord.File(fp=plot_buf, filename="plot.png")
         embed = discord.Embed(
@@ -1467,6 +3523,108 @@ async def prop_finder(ctx, *, player_name_prop):
     else:
         await ctx.send(f"No game log data found for '{player_name}'.")
 
+
+# Prop scan: one market for every event on today's slate (from the event odds
+# cache), joined against game logs already in memory or the warehouse and
+# ranked by the best Over line's hit-rate edge over its implied probability
+PROP_SCAN_TOP_N = 10
+PROP_SCAN_MAX_TOP_N = 25
+PROP_SCAN_MIN_GAMES = 10
+
+
+# A stored game log, stale or not; the scan never fetches from CBS
+async def get_stored_game_log_record(url):
+    entry = game_log_cache.get(url)
+    if entry is None:
+        entry = await asyncio.to_thread(load_game_log, url)
+        if entry:
+            game_log_cache[url] = entry
+    return entry['record'] if entry else None
+
+
+# Ranks (player name, game log record, over lines) candidates in one worker thread
+def rank_prop_candidates(candidates, header_name):
+    ranked = []
+    for player_name, record, lines in candidates:
+        summary = analyze_prop(record['columns'][header_name], record['columns'].get('opp'), lines)
+        if summary is None or summary['games'] < PROP_SCAN_MIN_GAMES or not summary['lines']:
+            continue
+        best = max(summary['lines'], key=lambda line: line['edge'])
+        ranked.append((best['edge'], player_name, summary['games'], best))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return ranked
+
+
+@prop.command(name='scan')
+async def prop_scan(ctx, prop: str, top_n: int = PROP_SCAN_TOP_N):
+    api_key = os.getenv('ODDS_API_KEY')
+    market = market_identifiers.get(prop.lower())
+    header_name = prop_identifiers.get(prop.lower())
+    if not market or not header_name:
+        await ctx.send(f"Unknown prop '{prop}'. Use `mlb prop help` to see the available markets.")
+        return
+    top_n = min(max(top_n, 1), PROP_SCAN_MAX_TOP_N)
+
+    todays_games = await get_todays_games()
+    if not todays_games:
+        await ctx.send("No games found for today.")
+        return
+
+    # One concurrent sweep over every event, answered from the event odds cache when warm
+    all_market_odds = await asyncio.gather(*[
+        get_event_market_odds(game_id, market, api_key) for game_id in todays_games
+    ], return_exceptions=True)
+
+    over_lines = {}
+    for market_odds in all_market_odds:
+        if not market_odds or isinstance(market_odds, Exception):
+            continue
+        for bookmaker in market_odds:
+            for outcome in bookmaker['outcomes']:
+                if outcome.get('name') != 'Over' or outcome.get('point') is None:
+                    continue
+                lines = over_lines.setdefault(outcome['description'], [])
+                if (outcome['point'], outcome['price']) not in lines:
+                    lines.append((outcome['point'], outcome['price']))
+
+    if not over_lines:
+        await ctx.send(f"No {prop} odds found on today's slate.")
+        return
+
+    if player_index['built_at'] is None:
+        await refresh_player_index(force=False)
+
+    async def load_candidate(player_name, lines):
+        matches = search_players(player_name)
+        if not matches or not matches[0].get('player_link'):
+            return None
+        record = await get_stored_game_log_record(matches[0]['player_link'] + 'game-log/')
+        if not record or header_name not in record['columns']:
+            return None
+        return player_name, record, lines
+
+    candidates = await asyncio.gather(*(load_candidate(player_name, lines)
+                                        for player_name, lines in over_lines.items()))
+    candidates = [candidate for candidate in candidates if candidate]
+    ranked = await asyncio.to_thread(rank_prop_candidates, candidates, header_name)
+    if not ranked:
+        await ctx.send(f"No stored game logs to rank for {prop} yet. Try again after `mlb warehouse_logs`.")
+        return
+
+    rows = []
+    for rank, (edge, player_name, games, line) in enumerate(ranked[:top_n], start=1):
+        sign = '+' if line['price'] > 0 else ''
+        rows.append(f"{rank}. **{player_name}** Over {line['point']:g} [{sign}{line['price']}]: "
+                    f"hit {line['hit_rate']:.0%} vs implied {line['implied']:.0%} "
+                    f"(edge {edge:+.0%}, {games} games)")
+    embed = discord.Embed(
+        title=f"Top {prop.title()} Edges on Today's Slate",
+        description="\n".join(rows),
+        color=discord.Color.blue()
+    )
+    embed.set_footer(text=f"{len(ranked)} of {len(over_lines)} players with lines had enough game log data")
+    await ctx.send(embed=embed)
+
     # Create a help command for the bot
 
 
@@ -1499,10 +3657,15 @@ async def mlb_help(ctx):
         inline=False
     )
     embed.add_field(
-        name="mlb streak leaderboard",
+        name="mlb streak leaderboard [page]",
         value="View the current streak leaderboard.",
         inline=False
     )
+    embed.add_field(
+        name="mlb streak rank [@user]",
+        value="View your or another user's leaderboard rank.",
+        inline=False
+    )
     embed.add_field(
         name="mlb seasonstats <first_name> <last_name> <stat_category>",
         value="Get the current season stats for a player. Example: `mlb seasonstats aaron judge hitting`",
@@ -1513,9 +3676,38 @@ async def mlb_help(ctx):
         value="Get the career stats for a player. Example: `mlb careerstats mike trout hitting`",
         inline=False
     )
+    embed.add_field(
+        name="mlb compare <player> vs <player> [vs ...] <stat_category>",
+        value="Compare this season's stats for up to 4 players side by side. Example: `mlb compare aaron judge vs juan soto hitting`",
+        inline=False
+    )
+    embed.add_field(
+        name="mlb stats <first_name> <last_name> <stat_category> [season|career|last [games]|range <start> <end>|years]",
+        value="Get a player's stats for any span. Example: `mlb stats aaron judge hitting last 10`",
+        inline=False
+    )
+    embed.add_field(
+        name="mlb config [set|clear] <odds|scores|streak> [#channel]",
+        value="Show or change where this server gets odds, scores and streak posts (requires Manage Server). Example: `mlb config set odds #betting`",
+        inline=False
+    )
 
     await ctx.send(embed=embed)
 
 
+# Starts the bot and closes the shared HTTP session on shutdown
+async def run_bot():
+    async with bot:
+        try:
+            startup_state['login_started'] = time.perf_counter()
+            await bot.start(os.getenv('BOT_TOKEN'))
+        finally:
+            await close_http_session()
+
+
 # Run the bot with the token from the developer portal
-bot.run(os.getenv('BOT_TOKEN'))
+discord.utils.setup_logging()
+try:
+    asyncio.run(run_bot())
+except KeyboardInterrupt:
+    pass
@@ -0,0 +1,9 @@
+-- Stored Eastern game date so "today's games" is a date-scoped, indexed query
+alter table games add column if not exists game_date date;
+
+-- commence_time holds Eastern wall-clock time, so its date part is the game date
+update games
+set game_date = left(commence_time::text, 10)::date
+where game_date is null;
+
+create index if not exists games_game_date_idx on games (game_date);
@@ -0,0 +1,2 @@
+-- Lets the leaderboard ask for ordered, limited pages and rank counts by streak
+create index if not exists users_streak_idx on users (streak desc);
@@ -0,0 +1,2 @@
+-- Caches the MLB Stats API person id so stats commands skip statsapi.lookup_player
+alter table players add column if not exists mlb_id integer;
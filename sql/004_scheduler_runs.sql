@@ -0,0 +1,7 @@
+-- Last-run markers for the scheduler, so missed daily jobs catch up after a restart
+create table if not exists scheduler_runs (
+    job_name text primary key,
+    last_run_date date not null,
+    status text,
+    finished_at timestamptz default now()
+);
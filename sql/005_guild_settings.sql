@@ -0,0 +1,8 @@
+-- Per-guild channel routing for odds, scores and streak posts
+create table if not exists guild_settings (
+    guild_id bigint primary key,
+    odds_channel_id bigint,
+    scores_channel_id bigint,
+    streak_channel_id bigint,
+    updated_at timestamptz default now()
+);